@@ -0,0 +1,59 @@
+from typing import Iterable, Optional
+from tortoise.expressions import F
+from app.config.settings import settings
+from app.database.connection import read_connection
+from app.database.models.users import User
+from app.auth.principal_cache import principal_cache
+from app.utils.ttl_cache import TTLCache
+import logging
+
+logger = logging.getLogger("devanchor.auth.authz_epochs")
+
+_MISSING = object()
+
+class AuthzEpochRegistry:
+    """
+    Each user's current authz epoch, read from `users.authzEpoch` (a primary key lookup) and
+    cached for `ttl_seconds`. The database is the state shared by every worker, so a bump
+    made by one worker is seen by all others within `ttl_seconds`; the worker making it
+    sees it immediately.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._epochs = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.reads = 0
+
+    def observe(self, user_id: str, epoch: int) -> None:
+        known = self._epochs.get(user_id)
+        if known is None or epoch > known:
+            self._epochs.set(user_id, epoch)
+
+    async def current_epoch(self, user_id: str) -> Optional[int]:
+        """The user's current epoch, or None if the user no longer exists."""
+        epoch = self._epochs.get(user_id, _MISSING)
+        if epoch is _MISSING:
+            self.reads += 1
+            epochs = await User.filter(id=user_id).using_db(read_connection()).values_list("authzEpoch", flat=True)
+            epoch = epochs[0] if epochs else None
+            self._epochs.set(user_id, epoch)
+        return epoch
+
+    def stats(self) -> dict:
+        return {"reads": self.reads, **self._epochs.stats()}
+
+authz_epochs = AuthzEpochRegistry(
+    max_size=settings.AUTHZ_EPOCH_REGISTRY_MAX_SIZE,
+    ttl_seconds=settings.AUTHZ_EPOCH_TTL_SECONDS,
+)
+
+async def bump_authz_epoch(user_ids: Iterable[str]) -> None:
+    """Mark role claims issued to `user_ids` as stale and drop their cached principals."""
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return
+
+    await User.filter(id__in=user_ids).update(authzEpoch=F("authzEpoch") + 1)
+    for user_id, epoch in await User.filter(id__in=user_ids).values_list("id", "authzEpoch"):
+        authz_epochs.observe(user_id, epoch)
+        principal_cache.invalidate(user_id)
+    logger.debug(f"Bumped authz epoch for {len(user_ids)} users")
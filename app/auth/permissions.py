@@ -1,8 +1,8 @@
 from fastapi import HTTPException
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 from app.utils.constants import ErrorMessages
-import re
 import logging
+import re
 
 logger = logging.getLogger("devanchor.auth.permissions")
 
@@ -56,35 +56,131 @@ PERMISSIONS = {
     "/api/v1/bookings": {
         "GET": ["*"], 
     },
+    "/api/v1/metrics": {
+        "GET": ["admin"],
+    },
 }
 
-def normalize_path(path: str) -> str:
-    uuid_pattern = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
-    normalized = re.sub(uuid_pattern, "{user_id}", path)
-    normalized = normalized.replace("{user_id}", "{role_id}", 1) if "/roles/" in path else normalized
-    return normalized
+PUBLIC_ROLE = "*"
 
-async def check_permissions(path: str, method: str, user_roles: List[str]) -> None:
+# Path parameters are resource ids, so a {param} segment only matches a lowercase UUID
+PARAM_SEGMENT = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+class RoleRegistry:
+    """
+    Assigns each role name mentioned in PERMISSIONS a bit. Bit 0 is the "*" role, which
+    every authenticated principal carries; role names that no route mentions get no bit.
+    """
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {PUBLIC_ROLE: 1}
+        self._mask_cache: Dict[Tuple[str, ...], int] = {}
+
+    def bit(self, role: str) -> int:
+        if role not in self._bits:
+            self._bits[role] = 1 << len(self._bits)
+        return self._bits[role]
+
+    def mask(self, roles: Iterable[str]) -> int:
+        """Bitmask for a principal's role set (always including "*"), memoized per role tuple."""
+        key = tuple(roles)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = self._bits[PUBLIC_ROLE]
+            for role in key:
+                mask |= self._bits.get(role, 0)
+            if len(self._mask_cache) >= 1024:
+                self._mask_cache.clear()
+            self._mask_cache[key] = mask
+        return mask
+
+class _RouteNode:
+    __slots__ = ("children", "param", "methods")
 
-    normalized_path = normalize_path(path)
-    logger.debug(f"Checking permissions for {method} {normalized_path} with roles: {user_roles}")
+    def __init__(self):
+        self.children: Dict[str, "_RouteNode"] = {}
+        self.param: Optional["_RouteNode"] = None
+        self.methods: Optional[Dict[str, int]] = None
 
-    path_permissions = PERMISSIONS.get(normalized_path)
+class PermissionMatcher:
+    """
+    PERMISSIONS compiled into a segment trie, plus an exact-path table for routes without
+    parameters. `{name}` segments match a single UUID segment (PARAM_SEGMENT), literal
+    segments win over parameters (so /users/me is not /users/{user_id}), and each route
+    stores a precomputed {method: allowed role mask}.
+    """
+
+    def __init__(self, permissions: Dict[str, Dict[str, List[str]]], registry: Optional[RoleRegistry] = None):
+        self.registry = registry or RoleRegistry()
+        self._root = _RouteNode()
+        self._static: Dict[str, Dict[str, int]] = {}  # Parameter-free routes resolve with one dict lookup
+        for path, methods in permissions.items():
+            node = self._root
+            for segment in path.split("/"):
+                if segment.startswith("{") and segment.endswith("}"):
+                    node.param = node.param or _RouteNode()
+                    node = node.param
+                else:
+                    node = node.children.setdefault(segment, _RouteNode())
+            node.methods = {
+                method: self._roles_mask(roles) for method, roles in methods.items() if roles
+            }
+            if "{" not in path:
+                self._static[path] = node.methods
+
+    def _roles_mask(self, roles: List[str]) -> int:
+        mask = 0
+        for role in roles:
+            mask |= self.registry.bit(role)
+        return mask
+
+    def match(self, path: str) -> Optional[Dict[str, int]]:
+        """Return the {method: role mask} table of the route matching `path`, or None."""
+        methods = self._static.get(path)
+        if methods is not None:
+            return methods
+        segments = path.split("/")
+        node = self._root
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.param if PARAM_SEGMENT.fullmatch(segment) else None
+                if child is None:
+                    break
+            node = child
+        else:
+            if node.methods is not None:
+                return node.methods
+        # The greedy literal-first walk failed; retry with backtracking into parameters
+        return self._match(self._root, segments, 0)
+
+    def _match(self, node: _RouteNode, segments: List[str], index: int) -> Optional[Dict[str, int]]:
+        if index == len(segments):
+            return node.methods
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            methods = self._match(child, segments, index + 1)
+            if methods is not None:
+                return methods
+        if node.param is not None and PARAM_SEGMENT.fullmatch(segment):
+            return self._match(node.param, segments, index + 1)
+        return None
+
+permission_matcher = PermissionMatcher(PERMISSIONS)
+
+async def check_permissions(path: str, method: str, user_roles: List[str]) -> None:
+    """Raise 403 unless one of `user_roles` may call `method` on `path` (a raw request path)."""
+    path_permissions = permission_matcher.match(path)
     if not path_permissions:
-        logger.warning(f"No permissions defined for path: {normalized_path}")
+        logger.warning(f"No permissions defined for path: {path}")
         raise HTTPException(status_code=403, detail=ErrorMessages.FORBIDDEN)
 
-    allowed_roles = path_permissions.get(method)
-    if not allowed_roles:
-        logger.warning(f"No permissions defined for method {method} on path: {normalized_path}")
+    allowed_mask = path_permissions.get(method)
+    if not allowed_mask:
+        logger.warning(f"No permissions defined for method {method} on path: {path}")
         raise HTTPException(status_code=403, detail=ErrorMessages.FORBIDDEN)
 
-    if "*" in allowed_roles:
-        logger.debug(f"Access granted for {method} {normalized_path} (all roles allowed)")
-        return
-
-    if not any(role in allowed_roles for role in user_roles):
-        logger.warning(f"Access denied for user with roles {user_roles} to {method} {normalized_path}")
+    if not allowed_mask & permission_matcher.registry.mask(user_roles):
+        logger.warning(f"Access denied for user with roles {user_roles} to {method} {path}")
         raise HTTPException(status_code=403, detail=ErrorMessages.FORBIDDEN)
-
-    logger.debug(f"Access granted for user with roles {user_roles} to {method} {normalized_path}")
\ No newline at end of file
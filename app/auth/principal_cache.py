@@ -0,0 +1,60 @@
+from typing import Optional, Tuple
+from app.config.settings import settings
+from app.database.connection import read_connection
+from app.database.models.user_roles import UserRole
+from app.database.models.users import User
+from app.utils.ttl_cache import TTLCache
+import logging
+
+logger = logging.getLogger("devanchor.auth.principal_cache")
+
+class PrincipalCache:
+    """
+    Per-process cache of authenticated principals: a user's authz epoch and role names, keyed
+    by user id. The user row itself is not cached (routes that need it load it per request),
+    so profile changes are never served stale and no ORM instance is shared between requests.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, enabled: bool = True):
+        self.enabled = enabled
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    async def get_principal(self, user_id: str, min_epoch: Optional[int] = None) -> Optional[Tuple[int, Tuple[str, ...]]]:
+        """
+        Return (authz_epoch, role_names) for `user_id`, or None if the user does not exist,
+        loading from the database on a miss. A cached entry older than `min_epoch` (roles
+        changed, possibly by another worker) is reloaded.
+        """
+        if self.enabled:
+            principal = self._cache.get(user_id)
+            if principal is not None:
+                if min_epoch is None or principal[0] >= min_epoch:
+                    return principal
+                self.invalidate(user_id)
+
+        connection = read_connection()
+        epochs = await User.filter(id=user_id).using_db(connection).values_list("authzEpoch", flat=True)
+        if not epochs:
+            return None
+
+        role_names = await UserRole.filter(user_id=user_id).using_db(connection).values_list("role__name", flat=True)
+        principal = (epochs[0], tuple(role_names))
+        if self.enabled:
+            self._cache.set(user_id, principal)
+        return principal
+
+    def invalidate(self, user_id: str) -> None:
+        if self._cache.pop(user_id):
+            logger.debug(f"Invalidated cached principal for user: {user_id}")
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, **self._cache.stats()}
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+)
@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 import os
+import tempfile
 
 load_dotenv()
 
@@ -14,13 +15,100 @@ class Settings:
     # Application Environment
     environment = os.getenv("ENVIRONMENT", "production")  # development, production, or testing
 
+    # Launcher Config (python -m app.launcher); LAUNCH_ID is set by the launcher for its workers
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1)))
+    WEB_HOST = os.getenv("WEB_HOST", "127.0.0.1")
+    WEB_PORT = int(os.getenv("WEB_PORT", "8000"))
+    LAUNCH_ID = os.getenv("LAUNCH_ID", "")
+    STARTUP_READY_TIMEOUT_SECONDS = float(os.getenv("STARTUP_READY_TIMEOUT_SECONDS", "120"))  # how long workers wait for the leader
+    STARTUP_POLL_INTERVAL_SECONDS = float(os.getenv("STARTUP_POLL_INTERVAL_SECONDS", "0.1"))
+
+    # Logging Config: app log records are queued and written by a background thread in batches
+    LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "true").lower() == "true"
+    LOG_QUEUE_BATCH_SIZE = int(os.getenv("LOG_QUEUE_BATCH_SIZE", "256"))  # records written per flush at most
+    LOG_JSON_ENCODER = os.getenv("LOG_JSON_ENCODER", "auto")  # auto (orjson if installed), orjson, json, or a dotted path
+
+    # Access log: one completion record per request, sampled per route; non-2xx and slow requests are always logged
+    ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))  # fraction of other requests logged
+    ACCESS_LOG_ROUTE_SAMPLE_RATES = os.getenv("ACCESS_LOG_ROUTE_SAMPLE_RATES", "GET /api/v1/health=0")  # e.g. "GET /api/v1/classes=0.1"
+    ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "500"))
+
+    # Middleware stack: "pipeline" (single pure-ASGI pipeline) or "legacy" (one BaseHTTPMiddleware per concern)
+    MIDDLEWARE_MODE = os.getenv("MIDDLEWARE_MODE", "pipeline")
+
     # Test DB Config (for test environment)
     DB_FILE_TEST = os.getenv("DB_FILE_TEST", "./test.db")
+    # Skip Aerich at startup when every migration is applied and the models match the last recorded schema
+    DB_FAST_START = os.getenv("DB_FAST_START", "true").lower() == "true"
+
+    # SQLite Connection Profile (applied as PRAGMAs on every connection Tortoise opens)
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")  # WAL lets readers run alongside the writer
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # NORMAL is durable across app crashes in WAL mode; FULL also across power loss
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes; 0 disables memory-mapped reads
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative is KiB (64 MiB), positive is pages
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")  # DEFAULT, FILE or MEMORY
+    # Read-only connections (query_only) that serve read paths round-robin next to the single writer; WAL only, 0 disables
+    DB_READ_CONNECTIONS = int(os.getenv("DB_READ_CONNECTIONS", "2"))
 
     # JWT Config
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "60"))
+    # Active refresh tokens (sessions) kept per user; logging in beyond this evicts the oldest. 0 disables the cap
+    REFRESH_TOKEN_MAX_SESSIONS = int(os.getenv("REFRESH_TOKEN_MAX_SESSIONS", "5"))
+    # Embed role names and the user's authz epoch in access tokens so requests authorize without a DB lookup
+    JWT_ROLE_CLAIMS = os.getenv("JWT_ROLE_CLAIMS", "false").lower() == "true"
+    AUTHZ_EPOCH_REGISTRY_MAX_SIZE = int(os.getenv("AUTHZ_EPOCH_REGISTRY_MAX_SIZE", "100000"))
+    # How long a worker trusts its cached copy of a user's epoch; bounds how late other workers see a role change
+    AUTHZ_EPOCH_TTL_SECONDS = float(os.getenv("AUTHZ_EPOCH_TTL_SECONDS", "2"))
+    # Cache of verified token payloads, so repeat bearer tokens skip signature checks and JSON parsing
+    JWT_DECODE_CACHE_ENABLED = os.getenv("JWT_DECODE_CACHE_ENABLED", "true").lower() == "true"
+    JWT_DECODE_CACHE_MAX_SIZE = int(os.getenv("JWT_DECODE_CACHE_MAX_SIZE", "4096"))
+
+    # Rate Limit Config
+    RATE_LIMIT_MAX_REQUESTS = int(os.getenv("RATE_LIMIT_MAX_REQUESTS", "100"))
+    RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+    RATE_LIMIT_SWEEP_INTERVAL_SECONDS = float(os.getenv("RATE_LIMIT_SWEEP_INTERVAL_SECONDS", "60"))
+    RATE_LIMIT_KEY_BY_USER = os.getenv("RATE_LIMIT_KEY_BY_USER", "true").lower() == "true"
+    RATE_LIMIT_ROUTE_COSTS = os.getenv("RATE_LIMIT_ROUTE_COSTS", "")  # e.g. "POST /api/v1/users/login=5,POST /api/v1/book=2"
+    RATE_LIMIT_STORAGE = os.getenv("RATE_LIMIT_STORAGE", "memory")  # memory (per process) or sqlite (shared by all workers on the host)
+    RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "omnify_rate_limit.db"))
+
+    # Password Hashing Config (bcrypt runs off the event loop on a bounded pool)
+    PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # thread or process
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))  # waiting calls beyond this get 503
+    # bcrypt work factor; pick it with `python -m app.utils.password_calibration`. Existing hashes are rehashed on login
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+    # Principal Cache Config (per-process cache of authenticated users and their roles)
+    PRINCIPAL_CACHE_ENABLED = os.getenv("PRINCIPAL_CACHE_ENABLED", "true").lower() == "true"
+    PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+
+    # Class Listing Cache Config (per-process cache of GET /classes pages, invalidated on class/booking writes)
+    CLASS_CACHE_ENABLED = os.getenv("CLASS_CACHE_ENABLED", "true").lower() == "true"
+    CLASS_CACHE_MAX_SIZE = int(os.getenv("CLASS_CACHE_MAX_SIZE", "512"))
+    # Upper bound on staleness from writes handled by other worker processes
+    CLASS_CACHE_TTL_SECONDS = float(os.getenv("CLASS_CACHE_TTL_SECONDS", "5"))
+
+    # Booking Group Commit (opt-in: concurrent bookings within the window share one transaction and one commit)
+    BOOKING_GROUP_COMMIT_ENABLED = os.getenv("BOOKING_GROUP_COMMIT_ENABLED", "false").lower() == "true"
+    BOOKING_GROUP_COMMIT_WINDOW_MS = float(os.getenv("BOOKING_GROUP_COMMIT_WINDOW_MS", "5"))
+    BOOKING_GROUP_COMMIT_MAX_BATCH = int(os.getenv("BOOKING_GROUP_COMMIT_MAX_BATCH", "64"))  # flush early at this many bookings
+
+    # Maintenance Scheduler Config (periodic housekeeping jobs run by one worker per host; 0 interval disables a job)
+    MAINTENANCE_ENABLED = os.getenv("MAINTENANCE_ENABLED", "true").lower() == "true"
+    MAINTENANCE_JITTER = float(os.getenv("MAINTENANCE_JITTER", "0.1"))  # +/- fraction of each interval
+    # One worker per host runs the jobs (file lock next to the database); the others retry the lock this often
+    MAINTENANCE_LOCK_RETRY_SECONDS = float(os.getenv("MAINTENANCE_LOCK_RETRY_SECONDS", "30"))
+    MAINTENANCE_BATCH_SIZE = int(os.getenv("MAINTENANCE_BATCH_SIZE", "500"))
+    MAINTENANCE_MAX_BATCHES = int(os.getenv("MAINTENANCE_MAX_BATCHES", "20"))  # per job run; the rest waits for the next run
+    TOKEN_PURGE_INTERVAL_SECONDS = float(os.getenv("TOKEN_PURGE_INTERVAL_SECONDS", "3600"))
+    CLASS_DEACTIVATE_INTERVAL_SECONDS = float(os.getenv("CLASS_DEACTIVATE_INTERVAL_SECONDS", "300"))
+    BOOKING_ARCHIVE_INTERVAL_SECONDS = float(os.getenv("BOOKING_ARCHIVE_INTERVAL_SECONDS", "3600"))
+    BOOKING_ARCHIVE_AFTER_DAYS = int(os.getenv("BOOKING_ARCHIVE_AFTER_DAYS", "30"))  # bookings of classes older than this are archived
 
 settings = Settings()
\ No newline at end of file
@@ -1,8 +1,12 @@
-from tortoise import Tortoise
+from tortoise import BaseDBAsyncClient, Tortoise
+from tortoise.connection import connections
 from tortoise.exceptions import OperationalError
 from app.config.settings import settings
-from typing import AsyncGenerator, Tuple
-from aerich import Command
+from app.utils.startup_profile import startup_profile
+from typing import AsyncGenerator, Dict, Tuple, Union
+import hashlib
+import itertools
+import json
 import logging
 import os
 import time
@@ -17,14 +21,55 @@ def get_db_config():
     }
     return config
 
+def get_sqlite_pragmas() -> Dict[str, Union[str, int]]:
+    """Connection profile from settings; Tortoise runs every extra credential as `PRAGMA key=value`."""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+async def read_sqlite_pragmas(connection_name: str = "default") -> Dict[str, Union[str, int]]:
+    """
+    Values SQLite actually applied for each profile PRAGMA. They can differ from the
+    requested ones, e.g. `:memory:` databases stay in "memory" journal mode and mmap_size
+    is capped by the SQLite build.
+    """
+    connection = Tortoise.get_connection(connection_name)
+    effective = {}
+    for pragma in get_sqlite_pragmas():
+        _, rows = await connection.execute_query(f"PRAGMA {pragma}")
+        effective[pragma] = rows[0][0] if rows else None
+    return effective
+
+# Connection layout: "default" is the only connection that writes, and also serves everything
+# inside a write transaction. Its lock queues concurrent writers in arrival order, which is
+# the single-writer discipline SQLite needs anyway. "read_0".."read_N" are query_only
+# connections to the same WAL database; each runs on its own thread, so reads proceed in
+# parallel with each other and with the writer instead of queueing behind it.
+WRITE_CONNECTION = "default"
+READ_CONNECTIONS = tuple(
+    f"read_{i}" for i in range(settings.DB_READ_CONNECTIONS)
+) if settings.SQLITE_JOURNAL_MODE.upper() == "WAL" and get_db_config()["DB_FILE"] != ":memory:" else ()
+_read_turn = itertools.count()
+
+def _sqlite_connection(**extra_pragmas) -> dict:
+    return {
+        "engine": "tortoise.backends.sqlite",
+        "credentials": {
+            "file_path": get_db_config()["DB_FILE"],
+            **get_sqlite_pragmas(),
+            **extra_pragmas,
+        }
+    }
+
 TORTOISE_ORM = {
     "connections": {
-        "default": {
-            "engine": "tortoise.backends.sqlite",
-            "credentials": {
-                "file_path": get_db_config()["DB_FILE"],
-            }
-        }
+        WRITE_CONNECTION: _sqlite_connection(),
+        **{name: _sqlite_connection(query_only="ON") for name in READ_CONNECTIONS},
     },
     "apps": {
         "models": {
@@ -34,72 +79,160 @@ TORTOISE_ORM = {
     }
 }
 
+# What the app itself runs with: the same, minus aerich.models. That entry imports the whole
+# aerich package (~30 ms), which only the Aerich commands need; TORTOISE_ORM stays the config
+# for the aerich CLI and for init_db's migration path.
+APP_TORTOISE_ORM = {
+    **TORTOISE_ORM,
+    "apps": {"models": {**TORTOISE_ORM["apps"]["models"], "models": ["app.database.models"]}},
+}
+AERICH_MODEL = "Aerich"
+
+def read_connection_name() -> str:
+    """
+    Name of the next read-only connection, round-robin. Falls back to the writer when Tortoise
+    was initialized without readers (e.g. benchmarks on an in-memory database).
+    """
+    if not READ_CONNECTIONS or READ_CONNECTIONS[0] not in connections.db_config:
+        return WRITE_CONNECTION
+    return READ_CONNECTIONS[next(_read_turn) % len(READ_CONNECTIONS)]
+
+def read_connection() -> BaseDBAsyncClient:
+    """Connection for standalone reads. Reads that must see the current transaction's writes use that transaction instead."""
+    return Tortoise.get_connection(read_connection_name())
+
+async def connect_db() -> None:
+    """Initialize Tortoise ORM without touching migrations, for workers whose schema another process prepared."""
+    with startup_profile.phase("tortoise_init"):
+        await Tortoise.init(config=APP_TORTOISE_ORM)
+
+def schema_fingerprint(models_state: Dict[str, dict]) -> str:
+    """SHA-256 of a models description in the shape Aerich stores in `aerich.content`, key order independent."""
+    canonical = json.dumps(
+        models_state, sort_keys=True, default=lambda value: value.describe() if hasattr(value, "describe") else str(value)
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def describe_models(app: str = "models") -> Dict[str, dict]:
+    """Current description of the app's models, equivalent to `aerich.utils.get_models_describe`."""
+    described = {}
+    for model in Tortoise.apps[app].values():
+        description = model.describe()
+        if "name" in description:
+            described[description["name"]] = dict(description, managed=getattr(model.Meta, "managed", None))
+    return described
+
+async def schema_is_current(migrations_dir: str, app: str = "models") -> bool:
+    """
+    True when every migration file is recorded in the aerich table and the models match the
+    state Aerich stored with the latest migration, i.e. neither `upgrade` nor `migrate`
+    would do anything. Costs one directory listing and two small queries. Aerich's own
+    model is left out of the comparison, so this works without aerich.models registered.
+    """
+    connection = Tortoise.get_connection(WRITE_CONNECTION)
+    try:
+        _, applied = await connection.execute_query('SELECT "version" FROM "aerich" WHERE "app" = ?', [app])
+        _, latest = await connection.execute_query(
+            'SELECT "content" FROM "aerich" WHERE "app" = ? ORDER BY "id" DESC LIMIT 1', [app]
+        )
+    except OperationalError:
+        return False  # No aerich table yet
+    if not latest:
+        return False
+
+    migration_files = {name for name in os.listdir(migrations_dir) if name.endswith(".py")}
+    if not migration_files <= {row["version"] for row in applied}:
+        return False
+    stored, current = json.loads(latest[0]["content"]), describe_models(app)
+    for models_state in (stored, current):
+        models_state.pop(f"{app}.{AERICH_MODEL}", None)
+    return schema_fingerprint(stored) == schema_fingerprint(current)
+
+async def _migrate_with_aerich(migrations_dir: str) -> Tuple[bool, str]:
+    """The Aerich path of init_db: init-db, upgrade, and migrate + upgrade for model changes."""
+    if AERICH_MODEL not in Tortoise.apps["models"]:
+        # Aerich needs its own model registered, which the fast-start config leaves out
+        await Tortoise.close_connections()
+        await Tortoise.init(config=TORTOISE_ORM)
+
+    # Initialize Aerich
+    logger.debug("Initializing Aerich command")
+    from aerich import Command  # Imported here: it is slow to import and the fast path never needs it
+    aerich_command = Command(tortoise_config=TORTOISE_ORM, app="models", location="./migrations")
+    await aerich_command.init()
+
+    # Check if aerich table exists
+    logger.debug("Checking for aerich table")
+    connection = Tortoise.get_connection("default")
+    try:
+        await connection.execute_query("SELECT 1 FROM aerich LIMIT 1")
+        aerich_table_exists = True
+    except OperationalError:
+        aerich_table_exists = False
+
+    # Check for existing migration files
+    os.makedirs(migrations_dir, exist_ok=True)
+    existing_migrations = set(os.listdir(migrations_dir))
+    has_migration_files = bool(existing_migrations)
+
+    # Initialize database if aerich table and migrations are missing
+    if not aerich_table_exists and not has_migration_files:
+        logger.info("Aerich table and migrations not found, initializing database")
+        await aerich_command.init_db(safe=False)
+        logger.info("Aerich database initialized")
+        return True, "Aerich database initialized with initial migrations"
+    elif not aerich_table_exists:
+        logger.warning("Aerich table missing but migrations exist")
+        return False, (
+            "Aerich table not found but migration files exist. "
+            "Run 'aerich init-db' to create the aerich table, "
+            "then 'aerich upgrade' to apply existing migrations."
+        )
+
+    # Apply any unapplied migrations
+    logger.debug("Applying unapplied migrations")
+    await aerich_command.upgrade()
+
+    # Check for model changes by attempting to generate a migration
+    logger.debug("Checking for model changes")
+    before_migrations = set(os.listdir(migrations_dir))
+    migration_name = f"auto_migration_{int(time.time())}"
+    await aerich_command.migrate(migration_name)
+
+    # Check if a new migration file was created
+    after_migrations = set(os.listdir(migrations_dir))
+    new_migrations = after_migrations - before_migrations
+
+    if not new_migrations:
+        return True, "No schema changes detected, skipping migrations"
+
+    # Apply new migrations
+    logger.debug("Applying new migrations")
+    await aerich_command.upgrade()
+    return True, f"Schema migrations applied successfully: {new_migrations}"
+
 async def init_db() -> Tuple[bool, str]:
     """
     Initialize Tortoise ORM and check/apply migrations using Aerich.
     Skips initialization if already done and only generates new migrations for unapplied model changes.
+    With DB_FAST_START, Aerich is skipped entirely (not even imported) when the schema is current.
     Returns: (success: bool, reason: str)
     """
     try:
         # Initialize Tortoise ORM
         logger.debug("Initializing Tortoise ORM")
-        await Tortoise.init(config=TORTOISE_ORM)
+        with startup_profile.phase("tortoise_init"):
+            await Tortoise.init(config=APP_TORTOISE_ORM if settings.DB_FAST_START else TORTOISE_ORM)
 
-        # Initialize Aerich
-        logger.debug("Initializing Aerich command")
-        aerich_command = Command(tortoise_config=TORTOISE_ORM, app="models", location="./migrations")
-        await aerich_command.init()
-
-        # Check if aerich table exists
-        logger.debug("Checking for aerich table")
-        connection = Tortoise.get_connection("default")
-        try:
-            await connection.execute_query("SELECT 1 FROM aerich LIMIT 1")
-            aerich_table_exists = True
-        except OperationalError:
-            aerich_table_exists = False
-
-        # Check for existing migration files
         migrations_dir = "./migrations/models"
-        os.makedirs(migrations_dir, exist_ok=True)
-        existing_migrations = set(os.listdir(migrations_dir))
-        has_migration_files = bool(existing_migrations)
-
-        # Initialize database if aerich table and migrations are missing
-        if not aerich_table_exists and not has_migration_files:
-            logger.info("Aerich table and migrations not found, initializing database")
-            await aerich_command.init_db(safe=False)
-            logger.info("Aerich database initialized")
-            return True, "Aerich database initialized with initial migrations"
-        elif not aerich_table_exists:
-            logger.warning("Aerich table missing but migrations exist")
-            return False, (
-                "Aerich table not found but migration files exist. "
-                "Run 'aerich init-db' to create the aerich table, "
-                "then 'aerich upgrade' to apply existing migrations."
-            )
-
-        # Apply any unapplied migrations
-        logger.debug("Applying unapplied migrations")
-        await aerich_command.upgrade()
-
-        # Check for model changes by attempting to generate a migration
-        logger.debug("Checking for model changes")
-        before_migrations = set(os.listdir(migrations_dir))
-        migration_name = f"auto_migration_{int(time.time())}"
-        await aerich_command.migrate(migration_name)
-
-        # Check if a new migration file was created
-        after_migrations = set(os.listdir(migrations_dir))
-        new_migrations = after_migrations - before_migrations
-
-        if not new_migrations:
-            return True, "No schema changes detected, skipping migrations"
-
-        # Apply new migrations
-        logger.debug("Applying new migrations")
-        await aerich_command.upgrade()
-        return True, f"Schema migrations applied successfully: {new_migrations}"
+        if settings.DB_FAST_START and os.path.isdir(migrations_dir):
+            with startup_profile.phase("schema_check"):
+                schema_current = await schema_is_current(migrations_dir)
+            if schema_current:
+                return True, "No schema changes detected (schema fingerprint matches the aerich table), skipping Aerich"
+
+        with startup_profile.phase("aerich"):
+            return await _migrate_with_aerich(migrations_dir)
     except OperationalError as e:
         logger.error(f"Database error during initialization: {str(e)}", exc_info=True)
         return False, (
@@ -0,0 +1,121 @@
+from typing import Any, Awaitable, Callable, List, Tuple
+from tortoise.transactions import in_transaction
+import asyncio
+import logging
+
+logger = logging.getLogger("devanchor.database.group_commit")
+
+class GroupCommitWriter:
+    """
+    Coalesces concurrent write units into one transaction, so a burst pays for one commit
+    (and one fsync) instead of one per request.
+
+    `submit(func, *args)` queues a unit and waits. The first unit of a batch starts a
+    `window_ms` timer; the batch is flushed when the timer fires or it reaches `max_batch`
+    units. Each unit runs inside its own savepoint within the shared transaction: a unit
+    that raises is rolled back alone and its caller gets the exception, while the others
+    still commit. Results are only handed back after the commit, and if the commit itself
+    fails every caller in the batch gets that error.
+
+    A caller cancelled (e.g. by the request timeout) while its unit is still queued drops
+    the unit, which then never runs. Once the unit has started it will commit with its
+    batch, so the caller ignores the cancellation and waits for the real outcome rather
+    than reporting a failure for a write that happened.
+    """
+
+    def __init__(self, connection_name: str, window_ms: float, max_batch: int, enabled: bool = True):
+        self.connection_name = connection_name
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.enabled = enabled
+        self._pending: List[Tuple[Callable[..., Awaitable[Any]], tuple, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle = None
+        self._flushes = set()
+        self._started = set()  # Futures of units that have begun running in a flush
+        self.batches = 0
+        self.units = 0
+        self.failed_units = 0
+        self.cancelled_units = 0
+        self.max_batch_seen = 0
+
+    async def submit(self, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((func, args, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush_now)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if future not in self._started:
+                future.cancel()  # Still queued: the flush skips it
+                raise
+            return await future
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._flush(batch))
+            # Keep a reference until done so the task is not garbage collected mid-flush
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list) -> None:
+        outcomes = []
+        try:
+            async with in_transaction(self.connection_name):
+                for func, args, future in batch:
+                    if future.cancelled():
+                        outcomes.append(None)
+                        continue
+                    self._started.add(future)
+                    try:
+                        async with in_transaction(self.connection_name):  # savepoint
+                            outcomes.append((True, await func(*args)))
+                    except Exception as e:
+                        outcomes.append((False, e))
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} write(s) failed: {e}", exc_info=True)
+            for _, _, future in batch:
+                self._started.discard(future)
+                if future.cancelled():
+                    self.cancelled_units += 1
+                else:
+                    self.failed_units += 1
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.units += len(batch) - outcomes.count(None)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        for (_, _, future), outcome in zip(batch, outcomes):
+            self._started.discard(future)
+            if outcome is None:
+                self.cancelled_units += 1
+                continue
+            ok, value = outcome
+            if not ok:
+                self.failed_units += 1
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "units": self.units,
+            "failed_units": self.failed_units,
+            "cancelled_units": self.cancelled_units,
+            "avg_batch_size": round(self.units / self.batches, 2) if self.batches else 0.0,
+            "max_batch_seen": self.max_batch_seen,
+            "pending": len(self._pending),
+        }
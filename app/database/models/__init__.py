@@ -5,4 +5,5 @@ from .users import User
 from .refresh_tokens import RefreshToken
 from .user_roles import UserRole
 from .classes import Class
-from .bookings import Booking
\ No newline at end of file
+from .bookings import Booking
+from .bookings_archive import BookingArchive
\ No newline at end of file
@@ -0,0 +1,17 @@
+from tortoise.models import Model
+from tortoise import fields
+from app.database.models.enums import RecordStatus
+
+class BookingArchive(Model):
+    # Plain copies of a booking row moved out of the hot `bookings` table by the maintenance
+    # scheduler. No foreign keys, so archiving never blocks deleting users or classes.
+    id = fields.CharField(max_length=36, primary_key=True)
+    user_id = fields.CharField(max_length=36, index=True)
+    class_id = fields.CharField(max_length=36, index=True)
+    status = fields.CharEnumField(enum_type=RecordStatus)
+    createdAt = fields.DatetimeField()
+    updatedAt = fields.DatetimeField()
+    archivedAt = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "bookings_archive"
@@ -8,6 +8,7 @@ class Class(BaseModel):
     instructor = fields.ForeignKeyField("models.User", related_name="classes_taught", index=True)
     schedule = fields.DatetimeField(index=True)  # Date and time of the class
     slots = fields.IntField(default=10, constraints={"ge": 1})  # Maximum number of spots
+    booked_count = fields.IntField(default=0)  # Active bookings, kept in step with slots by create_booking
     status = fields.CharEnumField(enum_type=RecordStatus, default=RecordStatus.active, index=True)
 
     # Relationships
@@ -4,11 +4,11 @@ from app.database.models.enums import RecordStatus
 
 class RefreshToken(BaseModel):
     user = fields.ForeignKeyField("models.User", related_name="refresh_tokens", index=True)
-    token = fields.CharField(max_length=255, unique=True)
+    token_hash = fields.CharField(max_length=64, unique=True)  # Hex SHA-256 of the refresh JWT; the token itself is never stored
     expiresAt = fields.DatetimeField()
     revoked = fields.DatetimeField()
     status = fields.CharEnumField(enum_type=RecordStatus, default=RecordStatus.active)
 
     class Meta:
         table = "refresh_tokens"
-        indexes = ["user_id"]
\ No newline at end of file
+        indexes = (("user_id",), ("token_hash", "status"), ("status", "expiresAt"))  # Last one serves the purge job
\ No newline at end of file
@@ -9,6 +9,7 @@ class User(BaseModel):
     username = fields.CharField(max_length=255, unique=True, index=True)
     passwordHash = fields.CharField(max_length=255)
     status = fields.CharEnumField(enum_type=UserStatus, default=UserStatus.active, index=True)
+    authzEpoch = fields.IntField(default=0)  # Bumped whenever the user's effective roles change
 
     # Relationships
     refresh_tokens = fields.ReverseRelation["RefreshToken"]
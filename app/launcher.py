@@ -0,0 +1,114 @@
+"""
+Production launcher: serves the app on several uvicorn worker processes.
+
+    python -m app.launcher --workers 4 --host 0.0.0.0 --port 8000
+
+Every launch gets a fresh launch id, passed to the workers through LAUNCH_ID. At startup
+the workers elect one leader through an exclusive file lock next to the database; the
+leader runs migrations and seeding and then writes a readiness marker holding the
+launch id, while the other workers wait for that marker and only open their connections.
+A marker left by an earlier launch never matches, and if the leader dies before writing
+it, the lock is released and the next worker to grab it takes over.
+"""
+from typing import Awaitable, Callable
+from app.config.settings import settings
+from app.database.connection import get_db_config
+from app.utils.startup_profile import startup_profile
+import argparse
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger("devanchor.launcher")
+
+LEADER = "leader"
+FOLLOWER = "follower"
+SINGLE = "single"
+
+def startup_paths() -> tuple:
+    """(lock file, readiness marker) for the configured database."""
+    db_file = os.path.abspath(get_db_config()["DB_FILE"])
+    return f"{db_file}.startup.lock", f"{db_file}.ready"
+
+def _marker_matches(marker_path: str, launch_id: str) -> bool:
+    try:
+        with open(marker_path) as marker:
+            return marker.read().strip() == launch_id
+    except FileNotFoundError:
+        return False
+
+def _write_marker(marker_path: str, launch_id: str) -> None:
+    # Write then rename, so a waiting worker never reads a half-written marker
+    temp_path = f"{marker_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as marker:
+        marker.write(launch_id)
+    os.replace(temp_path, marker_path)
+
+async def run_startup_once(
+    leader_tasks: Callable[[], Awaitable[None]],
+    follower_tasks: Callable[[], Awaitable[None]],
+    launch_id: str = None,
+    timeout: float = None,
+) -> str:
+    """
+    Run `leader_tasks` in exactly one worker of this launch and `follower_tasks` in the rest,
+    once the leader has finished. Without a launch id (plain `uvicorn app.main:app`) this
+    process is the only one and runs `leader_tasks` itself.
+
+    Returns LEADER, FOLLOWER or SINGLE; raises RuntimeError if no leader finishes in time.
+    """
+    launch_id = settings.LAUNCH_ID if launch_id is None else launch_id
+    if not launch_id:
+        await leader_tasks()
+        return SINGLE
+
+    import fcntl  # POSIX only; the launcher is the only path that needs it
+
+    timeout = settings.STARTUP_READY_TIMEOUT_SECONDS if timeout is None else timeout
+    lock_path, marker_path = startup_paths()
+    deadline = time.monotonic() + timeout
+    waiting_since = time.perf_counter()
+    with open(lock_path, "a") as lock_file:
+        while True:
+            if _marker_matches(marker_path, launch_id):
+                startup_profile.record("leader_wait", since=waiting_since)
+                await follower_tasks()
+                return FOLLOWER
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                pass
+            else:
+                try:
+                    # The previous holder may have finished between our check and the lock
+                    startup_profile.record("leader_wait", since=waiting_since)
+                    if _marker_matches(marker_path, launch_id):
+                        await follower_tasks()
+                        return FOLLOWER
+                    logger.info(f"Elected startup leader for launch {launch_id} (pid {os.getpid()})")
+                    await leader_tasks()
+                    _write_marker(marker_path, launch_id)
+                    return LEADER
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Startup leader did not finish within {timeout:.0f}s (launch {launch_id})")
+            await asyncio.sleep(settings.STARTUP_POLL_INTERVAL_SECONDS)
+
+def main(workers: int, host: str, port: int):
+    import uvicorn
+
+    launch_id = uuid.uuid4().hex
+    os.environ["LAUNCH_ID"] = launch_id  # Inherited by every worker process
+    logger.info(f"Launching {workers} worker(s) on {host}:{port} (launch {launch_id})")
+    uvicorn.run("app.main:app", host=host, port=port, workers=workers)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS)
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.WEB_PORT)
+    args = parser.parse_args()
+    main(args.workers, args.host, args.port)
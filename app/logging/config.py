@@ -1,14 +1,22 @@
+import atexit
+import functools
+import importlib
 import logging
 import logging.config
 import os
+import queue
 import yaml
 import time
 import json
-from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Optional
 from app.config.settings import settings
+from app.logging.handlers import BatchingQueueListener, DeferredQueueHandler
+
+_listener: Optional[BatchingQueueListener] = None
 
 def setup_logging():
     """Configure the logging system using a YAML file or defaults."""
+    stop_log_queue()  # Flush and release the handlers of an earlier configuration
     log_dir = "logs"
     os.makedirs(log_dir, exist_ok=True)
     
@@ -28,7 +36,7 @@ def setup_logging():
         },
         "handlers": {
             "file": {
-                "class": "logging.handlers.RotatingFileHandler",
+                "class": "app.logging.handlers.BufferedRotatingFileHandler",
                 "level": "DEBUG",
                 "formatter": "json",
                 "filename": os.path.join(log_dir, "app.log"),
@@ -36,7 +44,7 @@ def setup_logging():
                 "backupCount": 5
             },
             "console": {
-                "class": "logging.StreamHandler",
+                "class": "app.logging.handlers.BufferedStreamHandler",
                 "level": "DEBUG" if settings.environment == "development" else "INFO",
                 "formatter": "console" if os.getenv("LOG_CONSOLE_JSON", "false").lower() != "true" else "json"
             }
@@ -64,17 +72,90 @@ def setup_logging():
     
     # Apply configuration
     logging.config.dictConfig(config)
+    if settings.LOG_QUEUE_ENABLED:
+        start_log_queue()
+
+def start_log_queue(logger_name: str = "devanchor"):
+    """
+    Move the logger's handlers behind a queue: the logging call only enqueues the record,
+    and a listener thread formats, encodes and writes it, flushing once per batch.
+    """
+    global _listener
+    stop_log_queue()
+    target = logging.getLogger(logger_name)
+    handlers = list(target.handlers)
+    if not handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(DeferredQueueHandler(log_queue))
+    _listener = BatchingQueueListener(log_queue, *handlers, batch_size=settings.LOG_QUEUE_BATCH_SIZE)
+    _listener.start()
+
+def stop_log_queue():
+    """Write out everything still queued and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_log_queue)
+
+def log_queue_stats() -> dict:
+    stats = {"enabled": _listener is not None, "json_encoder": load_json_encoder(settings.LOG_JSON_ENCODER).__name__}
+    if _listener is not None:
+        stats.update(_listener.stats())
+    return stats
+
+@functools.lru_cache(maxsize=None)
+def load_json_encoder(name: str) -> Callable[[Any], str]:
+    """
+    JSON encoder for log records: "orjson", "json", "auto" (orjson when installed, else the
+    stdlib) or the dotted path of a callable taking a dict and returning str or bytes.
+    """
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+        except ImportError:
+            pass  # Fall back to the stdlib encoder
+        else:
+            def orjson_dumps(data: Any) -> str:
+                return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+            return orjson_dumps
+    if name in ("auto", "orjson", "json"):
+        def json_dumps(data: Any) -> str:
+            return json.dumps(data, default=str)
+        return json_dumps
+
+    module_name, _, attribute = name.rpartition(".")
+    encode = getattr(importlib.import_module(module_name), attribute)
+    def custom_dumps(data: Any) -> str:
+        encoded = encode(data)
+        return encoded.decode() if isinstance(encoded, bytes) else encoded
+    custom_dumps.__name__ = name
+    return custom_dumps
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.encode = load_json_encoder(settings.LOG_JSON_ENCODER)
+        self._second = (None, "")  # (epoch second, its formatted date/time), swapped as one tuple
+
     def format(self, record):
         try:
-            # Convert record.created (float timestamp) to struct_time
-            ct = time.localtime(record.created)
-            # Format timestamp with milliseconds
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", ct)
+            # Timestamp with microseconds; the date/time part only changes once a second
+            second, prefix = self._second
+            if second != int(record.created):
+                second = int(record.created)
+                prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+                self._second = (second, prefix)
             microsecond = int(record.msecs * 1000)
-            timestamp = f"{timestamp}.{microsecond:06d}"
+            timestamp = f"{prefix}.{microsecond:06d}"
 
             log_data = {
                 "timestamp": timestamp,
@@ -87,8 +168,14 @@ class JSONFormatter(logging.Formatter):
             }
             if record.exc_info:
                 log_data["exception"] = self.formatException(record.exc_info)
-            if hasattr(record, 'extra'):
-                log_data.update(getattr(record, 'extra', {}))
-            return json.dumps(log_data)
+            elif record.exc_text:  # Rendered before the record was queued
+                log_data["exception"] = record.exc_text
+            for key, value in record.__dict__.items():
+                if key not in _RECORD_ATTRIBUTES:
+                    if key == "extra" and isinstance(value, dict):
+                        log_data.update(value)
+                    else:
+                        log_data[key] = value
+            return self.encode(log_data)
         except Exception as e:
             return json.dumps({"error": f"Failed to format log: {str(e)}"})
\ No newline at end of file
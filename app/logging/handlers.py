@@ -0,0 +1,125 @@
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import logging
+import os
+import queue
+import threading
+
+_traceback_formatter = logging.Formatter()
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queues records for a listener thread, doing only what must happen on the calling thread:
+    merging msg/args (args may be mutated later) and rendering any traceback. Formatting
+    and encoding happen on the listener thread, and `extra` attributes travel unchanged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler whose per-record flush can be deferred to the end of a listener batch."""
+
+    defer_flush = False
+
+    def flush(self):
+        if not self.defer_flush:
+            super().flush()
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that formats each record once, tracks the file size itself instead
+    of seek()/tell() per record (both force a flush), and lets the listener defer flushing
+    to the end of a batch. Sizes are counted in characters, so a file holding non-ASCII
+    text can run slightly past maxBytes before it rolls over.
+    """
+
+    defer_flush = False
+
+    def _open(self):
+        stream = super()._open()
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def flush(self):
+        if not self.defer_flush:
+            super().flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size and self._size + len(msg) >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += len(msg)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that drains up to `batch_size` queued records at a time, hands each to the
+    handlers with per-record flushing deferred, then flushes every handler once.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, *handlers: logging.Handler, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = max(1, batch_size)
+        self.batches = 0
+        self.records = 0
+        self.max_batch_seen = 0
+        self._stats_lock = threading.Lock()
+
+    def _monitor(self):
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size and batch[-1] is not self._sentinel:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = batch[-1] is self._sentinel
+            records = batch[:-1] if stopping else batch
+            self._set_defer_flush(True)
+            try:
+                for record in records:
+                    self.handle(record)
+            finally:
+                self._set_defer_flush(False)
+                for handler in self.handlers:
+                    handler.flush()
+            if records:
+                with self._stats_lock:
+                    self.batches += 1
+                    self.records += len(records)
+                    self.max_batch_seen = max(self.max_batch_seen, len(records))
+            if stopping:
+                break
+
+    def _set_defer_flush(self, defer: bool) -> None:
+        for handler in self.handlers:
+            if hasattr(handler, "defer_flush"):
+                handler.defer_flush = defer
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "batch_size": self.batch_size,
+                "queued": self.queue.qsize(),
+                "batches": self.batches,
+                "records": self.records,
+                "avg_batch_size": round(self.records / self.batches, 2) if self.batches else 0.0,
+                "max_batch_seen": self.max_batch_seen,
+            }
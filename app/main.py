@@ -1,13 +1,9 @@
+from app.utils.startup_profile import startup_profile  # First, so the "imports" phase covers everything below
 from fastapi import FastAPI
 from tortoise import Tortoise
-from app.database.connection import init_db
-from app.middleware.cors import add_cors_middleware
-from app.middleware.logger import add_logging_middleware
-from app.middleware.error_handler import add_error_handler_middleware
-from app.middleware.gzip import add_gzip_middleware
-from app.middleware.rate_limit import add_rate_limit_middleware
-from app.middleware.timeout import add_timeout_middleware
-from app.middleware.auth import add_auth_middleware
+from app.database.connection import READ_CONNECTIONS, connect_db, init_db, read_sqlite_pragmas
+from app.launcher import run_startup_once
+from app.middleware.pipeline import add_middleware_stack
 from app.logging.config import setup_logging
 from app.routes.health_api import router as health_router
 from app.routes.roles import router as roles_router
@@ -15,44 +11,45 @@ from app.routes.user import router as users_router
 from app.routes.tokens import router as token_router
 from app.routes.classes import router as classes_router
 from app.routes.bookings import router as bookings_router
+from app.routes.metrics import router as metrics_router
 from app.database.models.roles import Role
+from app.utils.password_utils import password_hasher
+from app.services.maintenance import maintenance_scheduler
 from app.database.models.enums import RecordStatus
 import logging
 
-setup_logging()
+startup_profile.record("imports", since=startup_profile.created)
+with startup_profile.phase("setup_logging"):
+    setup_logging()
 logger = logging.getLogger("devanchor.main")
 
 app = FastAPI()
 
-add_cors_middleware(app)
-add_logging_middleware(app)
-add_gzip_middleware(app)
-add_rate_limit_middleware(app)
-add_timeout_middleware(app)
-add_auth_middleware(app)
-add_error_handler_middleware(app)
+with startup_profile.phase("middleware"):
+    add_middleware_stack(app)
 
 api_prefix="/api/v1"
-app.include_router(health_router, prefix=api_prefix)
-app.include_router(roles_router, prefix=api_prefix)
-app.include_router(users_router, prefix=api_prefix)
-app.include_router(token_router, prefix=api_prefix)
-app.include_router(classes_router, prefix=api_prefix)
-app.include_router(bookings_router, prefix=api_prefix)
+with startup_profile.phase("routers"):
+    app.include_router(health_router, prefix=api_prefix)
+    app.include_router(roles_router, prefix=api_prefix)
+    app.include_router(users_router, prefix=api_prefix)
+    app.include_router(token_router, prefix=api_prefix)
+    app.include_router(classes_router, prefix=api_prefix)
+    app.include_router(bookings_router, prefix=api_prefix)
+    app.include_router(metrics_router, prefix=api_prefix)
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Application startup initiated")
-    try:
-        success, reason = await init_db()
-        if success:
-            if "No schema changes" in reason:
-                logger.info("No Schema Changes Detected, Skipping Migrations")
-            else:
-                logger.info("Migrations Done")
+async def migrate_and_seed():
+    """Startup work that must run in one process per launch: migrations and seeding."""
+    success, reason = await init_db()
+    if success:
+        if "No schema changes" in reason:
+            logger.info("No Schema Changes Detected, Skipping Migrations")
         else:
-            logger.error(f"Migration Not Done Due to {reason}")
+            logger.info("Migrations Done")
+    else:
+        logger.error(f"Migration Not Done Due to {reason}")
 
+    with startup_profile.phase("role_seed"):
         client_role = await Role.get_or_none(name="client")
         if not client_role:
             client_role = await Role.create(
@@ -64,15 +61,35 @@ async def startup_event():
         else:
             logger.debug("'client' role already exists")
 
-        connection = Tortoise.get_connection("default")
-        await connection.execute_query("SELECT 1")
-        logger.info("Database connection verified")
+@app.on_event("startup")
+async def startup_event():
+    logger.info("Application startup initiated")
+    try:
+        # Under app.launcher one worker migrates and seeds while the others wait, then just connect
+        startup_role = await run_startup_once(migrate_and_seed, connect_db)
+        logger.info(f"Startup tasks done as {startup_role}")
+
+        with startup_profile.phase("db_verify"):
+            connection = Tortoise.get_connection("default")
+            await connection.execute_query("SELECT 1")
+            logger.info("Database connection verified")
+            pragmas = await read_sqlite_pragmas()
+        logger.info(
+            "SQLite profile: " + " ".join(f"{name}={value}" for name, value in pragmas.items())
+            + f" read_connections={len(READ_CONNECTIONS)}"
+        )
+
+        maintenance_scheduler.start()
     except Exception as e:
         logger.error(f"Unexpected error during startup: {str(e)}", exc_info=True)
         raise RuntimeError(f"Startup failure: {str(e)}")
+    startup_profile.finish(startup_role)
+    logger.info(f"Startup profile: {startup_profile.summary()}", extra={"startup": startup_profile.stats()})
     logger.info("Application startup complete")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Application shutdown initiated")
-    await Tortoise.close_connections()
\ No newline at end of file
+    await maintenance_scheduler.stop()
+    await Tortoise.close_connections()
+    password_hasher.shutdown()
\ No newline at end of file
@@ -1,84 +1,117 @@
 from fastapi import Request, HTTPException, Depends
 from starlette.middleware.base import BaseHTTPMiddleware
-from app.utils.jwt_utils import decode_token
+from app.utils.jwt_utils import decode_token_cached
 from app.database.models.users import User
 from app.utils.constants import ErrorMessages
-from app.auth.permissions import check_permissions, normalize_path
+from app.auth.permissions import check_permissions
+from app.auth.principal_cache import principal_cache
+from app.auth.authz_epochs import authz_epochs
+from app.database.connection import read_connection
 import logging
 
 logger = logging.getLogger("devanchor.middleware.auth")
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Middleware to enforce JWT authentication and role-based permissions for non-public APIs."""
-    public_routes = [
-        ("/api/v1/health", "GET"),       # Health check
-        ("/api/v1/users", "POST"),       # Signup
-        ("/api/v1/users/login", "POST"), # Login
-        ("/api/v1/roles", "GET"),        # List roles
-        ("/api/v1/roles", "POST"),       # Create role
-        ("/api/v1/auth/refresh", "POST"),# Refresh token
-    ]
+PUBLIC_ROUTES = [
+    ("/api/v1/health", "GET"),       # Health check
+    ("/api/v1/users", "POST"),       # Signup
+    ("/api/v1/users/login", "POST"), # Login
+    ("/api/v1/roles", "GET"),        # List roles
+    ("/api/v1/roles", "POST"),       # Create role
+    ("/api/v1/auth/refresh", "POST"),# Refresh token
+]
 
-    async def dispatch(self, request: Request, call_next):
-        # Check if the request matches a public route
-        path = request.url.path
-        method = request.method
-        if any(route_path == path and route_method == method for route_path, route_method in self.public_routes):
-            logger.debug(f"Skipping authentication for public route: {method} {path}")
-            return await call_next(request)
-
-        # Extract token from Authorization header
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            logger.warning("Missing or invalid Authorization header")
-            raise HTTPException(status_code=401, detail=ErrorMessages.UNAUTHORIZED)
-
-        token = auth_header.replace("Bearer ", "").strip()
-        if not token:
-            logger.warning("Empty token provided in Authorization header")
-            raise HTTPException(status_code=401, detail=ErrorMessages.UNAUTHORIZED)
-
-        # Basic token format validation
-        if len(token.split(".")) != 3:
-            logger.warning("Invalid JWT token format: incorrect number of segments")
-            raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+async def authenticate_request(request: Request) -> None:
+    """
+    Enforce JWT authentication and role-based permissions for a non-public request.
+    Attaches the caller to `request.state`; raises HTTPException on failure.
+    """
+    # Check if the request matches a public route
+    path = request.url.path
+    method = request.method
+    if any(route_path == path and route_method == method for route_path, route_method in PUBLIC_ROUTES):
+        logger.debug(f"Skipping authentication for public route: {method} {path}")
+        return
 
-        try:
-            # Decode token and extract user_id
-            payload = decode_token(token)
-            user_id = payload.get("sub")
-            if not user_id:
-                logger.warning("Token missing user_id")
-                raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+    # Extract token from Authorization header
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        logger.warning("Missing or invalid Authorization header")
+        raise HTTPException(status_code=401, detail=ErrorMessages.UNAUTHORIZED)
+
+    token = auth_header.replace("Bearer ", "").strip()
+    if not token:
+        logger.warning("Empty token provided in Authorization header")
+        raise HTTPException(status_code=401, detail=ErrorMessages.UNAUTHORIZED)
+
+    # Basic token format validation
+    if len(token.split(".")) != 3:
+        logger.warning("Invalid JWT token format: incorrect number of segments")
+        raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+
+    try:
+        # Decode token and extract user_id
+        payload = decode_token_cached(token)
+        user_id = payload.get("sub")
+        if not user_id:
+            logger.warning("Token missing user_id")
+            raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
 
-            # Fetch user from database
-            user = await User.get_or_none(id=user_id).prefetch_related("user_roles__role")
-            if not user:
+        request.state.user_id = user_id
+        token_roles = payload.get("roles")
+        current_epoch = None
+        if token_roles is not None:
+            # Shared (database) epoch, cached briefly: role changes made by any worker apply to this one
+            current_epoch = await authz_epochs.current_epoch(user_id)
+        if token_roles is not None and current_epoch is not None and payload.get("epoch", 0) >= current_epoch:
+            # Role claims are current: authorize from the verified token, the user row is loaded lazily
+            user_roles = token_roles
+            logger.debug(f"Authenticated user from token claims: {user_id}")
+        else:
+            # Fetch role names from the principal cache (for role-claim tokens, only if not older than the epoch)
+            principal = await principal_cache.get_principal(user_id, min_epoch=current_epoch)
+            if not principal:
                 logger.warning(f"User not found for id: {user_id}")
                 raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+            _, user_roles = principal
+            logger.debug(f"Authenticated user: {user_id}")
 
-            # Attach user to request state
-            request.state.user = user
-            logger.debug(f"Authenticated user: {user.email}")
+        # Check permissions based on user roles
+        await check_permissions(path, method, user_roles)
 
-            # Check permissions based on user roles
-            user_roles = [ur.role.name for ur in user.user_roles]
-            normalized_path = normalize_path(path)
-            await check_permissions(normalized_path, method, user_roles)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Authentication error: {str(e)}", extra={"token": "REDACTED"}, exc_info=True)
+        raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Authentication error: {str(e)}", extra={"token": "REDACTED"}, exc_info=True)
-            raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+class AuthMiddleware(BaseHTTPMiddleware):
+    """Middleware to enforce JWT authentication and role-based permissions for non-public APIs."""
+    public_routes = PUBLIC_ROUTES
 
+    async def dispatch(self, request: Request, call_next):
+        await authenticate_request(request)
         return await call_next(request)
 
+async def get_current_user_id(request: Request) -> str:
+    """Identity of the authenticated caller, without loading the user row."""
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        logger.warning("No authenticated user found in request state")
+        raise HTTPException(status_code=401, detail=ErrorMessages.UNAUTHORIZED)
+    return user_id
+
 async def get_current_user(request: Request) -> User:
     user = getattr(request.state, "user", None)
+    if user:
+        return user
+
+    # Load the user row on first use within the request; it is never cached across requests
+    user_id = await get_current_user_id(request)
+    user = await User.get_or_none(id=user_id).using_db(read_connection())
     if not user:
-        logger.warning("No authenticated user found in request state")
-        raise HTTPException(status_code=401, detail=ErrorMessages.UNAUTHORIZED)
+        logger.warning(f"User not found for id: {user_id}")
+        raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+    request.state.user = user
     return user
 
 def add_auth_middleware(app):
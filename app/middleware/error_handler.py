@@ -4,6 +4,35 @@ from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 import traceback
 
+def build_error_response(exc: Exception, request: Request, logger: logging.Logger) -> JSONResponse:
+    """Log an exception that escaped the request handlers and turn it into a JSON error response."""
+    if isinstance(exc, HTTPException):
+        log_data = {
+            "status_code": exc.status_code,
+            "detail": exc.detail,
+            "path": str(request.url.path),
+            "method": request.method
+        }
+        logger.error("HTTP Exception", extra=log_data)
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail}
+        )
+
+    stack_trace = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    log_data = {
+        "error_type": str(type(exc).__name__),
+        "error_message": str(exc),
+        "stack_trace": stack_trace,
+        "path": str(request.url.path),
+        "method": request.method
+    }
+    logger.error("Unhandled exception", extra=log_data)
+    return JSONResponse(
+        status_code=500,
+        content={"detail": "Internal Server Error"}
+    )
+
 class ErrorHandlerMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
@@ -13,32 +42,8 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         try:
             response = await call_next(request)
             return response
-        except HTTPException as e:
-            log_data = {
-                "status_code": e.status_code,
-                "detail": e.detail,
-                "path": str(request.url.path),
-                "method": request.method
-            }
-            self.logger.error("HTTP Exception", extra=log_data)
-            return JSONResponse(
-                status_code=e.status_code,
-                content={"detail": e.detail}
-            )
         except Exception as e:
-            stack_trace = "".join(traceback.format_exception(type(e), e, e.__traceback__))
-            log_data = {
-                "error_type": str(type(e).__name__),
-                "error_message": str(e),
-                "stack_trace": stack_trace,
-                "path": str(request.url.path),
-                "method": request.method
-            }
-            self.logger.error("Unhandled exception", extra=log_data)
-            return JSONResponse(
-                status_code=500,
-                content={"detail": "Internal Server Error"}
-            )
+            return build_error_response(e, request, self.logger)
 
 def add_error_handler_middleware(app):
-    app.add_middleware(ErrorHandlerMiddleware)
\ No newline at end of file
+    app.add_middleware(ErrorHandlerMiddleware)
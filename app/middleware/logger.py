@@ -1,52 +1,128 @@
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Dict, Optional, Tuple
+from app.config.settings import settings
 import logging
+import random
 import time
 
+def build_request_details(request: Request) -> dict:
+    return {
+        "method": request.method,
+        "url": str(request.url),
+        "client_ip": request.client.host,
+        "user_agent": request.headers.get("user-agent", "unknown"),
+        "query_params": dict(request.query_params),
+    }
+
+def parse_sample_rates(spec: str) -> Dict[Tuple[str, str], float]:
+    """Parse "GET /api/v1/health=0,GET /api/v1/classes=0.1" into {(method, path): rate}."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, rate = item.rpartition("=")
+        method, _, path = route.strip().partition(" ")
+        try:
+            value = float(rate)
+        except ValueError:
+            value = -1.0
+        if not method or not path or not 0.0 <= value <= 1.0:
+            raise ValueError(f"Invalid access log sample rate: {item!r}")
+        rates[(method.upper(), path.strip())] = value
+    return rates
+
+class AccessLogSampler:
+    """
+    Decides which completed requests get an access-log record: every non-2xx or slow
+    request, and a per-route sampled fraction of the rest.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = settings.ACCESS_LOG_SAMPLE_RATE,
+        route_rates: Optional[Dict[Tuple[str, str], float]] = None,
+        slow_ms: float = settings.ACCESS_LOG_SLOW_MS,
+    ):
+        self.default_rate = default_rate
+        self.route_rates = parse_sample_rates(settings.ACCESS_LOG_ROUTE_SAMPLE_RATES) if route_rates is None else route_rates
+        self.slow_ms = slow_ms
+        self.logged = 0
+        self.sampled_out = 0
+        self.always_logged = 0
+
+    def rate_for(self, method: str, path: str) -> float:
+        return self.route_rates.get((method, path), self.default_rate)
+
+    def reason_to_log(self, method: str, path: str, status_code: Optional[int], duration_ms: float) -> Optional[str]:
+        """"status" or "slow" for requests that are always logged, "sampled" if picked, else None."""
+        if status_code is None or not 200 <= status_code < 300:
+            reason = "status"
+        elif duration_ms >= self.slow_ms:
+            reason = "slow"
+        else:
+            rate = self.rate_for(method, path)
+            if rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+                self.logged += 1
+                return "sampled"
+            self.sampled_out += 1
+            return None
+        self.logged += 1
+        self.always_logged += 1
+        return reason
+
+    def log_completed(self, logger: logging.Logger, request: Request, status_code: Optional[int], start_time: float) -> None:
+        """Emit the request's single completion record, building its fields only if it is kept."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        method, path = request.method, request.scope["path"]
+        reason = self.reason_to_log(method, path, status_code, duration_ms)
+        if reason is None:
+            return
+        logger.info(
+            "Completed request",
+            extra={
+                "request": build_request_details(request),
+                "response": {
+                    "status_code": status_code,
+                    "duration_ms": round(duration_ms, 2)
+                },
+                "sampling": {"reason": reason, "rate": self.rate_for(method, path)},
+            }
+        )
+
+    def stats(self) -> dict:
+        return {
+            "default_rate": self.default_rate,
+            "route_rates": {f"{method} {path}": rate for (method, path), rate in self.route_rates.items()},
+            "slow_ms": self.slow_ms,
+            "logged": self.logged,
+            "always_logged": self.always_logged,
+            "sampled_out": self.sampled_out,
+        }
+
+access_log_sampler = AccessLogSampler()
+
 class LoggingMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
+    def __init__(self, app, sampler: AccessLogSampler = None):
         super().__init__(app)
+        self.sampler = sampler or access_log_sampler
         self.logger = logging.getLogger("devanchor.middleware.http")
 
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        request_details = {
-            "method": request.method,
-            "url": str(request.url),
-            "client_ip": request.client.host,
-            "user_agent": request.headers.get("user-agent", "unknown"),
-            "query_params": dict(request.query_params),
-        }
-        
-        self.logger.info(
-            "Incoming request",
-            extra={"request": request_details}
-        )
-        
+        start_time = time.perf_counter()
+
         try:
             response = await call_next(request)
-            
-            duration = time.time() - start_time
-            
-            self.logger.info(
-                "Completed request",
-                extra={
-                    "request": request_details,
-                    "response": {
-                        "status_code": response.status_code,
-                        "duration_ms": round(duration * 1000, 2)
-                    }
-                }
-            )
-            
+
+            self.sampler.log_completed(self.logger, request, response.status_code, start_time)
+
             return response
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             self.logger.error(
                 "Request failed",
                 extra={
-                    "request": request_details,
+                    "request": build_request_details(request),
                     "error": str(e),
                     "duration_ms": round(duration * 1000, 2)
                 },
@@ -55,4 +131,4 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             raise
 
 def add_logging_middleware(app):
-    app.add_middleware(LoggingMiddleware)
\ No newline at end of file
+    app.add_middleware(LoggingMiddleware)
@@ -0,0 +1,121 @@
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config.settings import settings
+from app.middleware.auth import add_auth_middleware, authenticate_request
+from app.middleware.cors import add_cors_middleware
+from app.middleware.error_handler import add_error_handler_middleware, build_error_response
+from app.middleware.gzip import add_gzip_middleware
+from app.middleware.logger import AccessLogSampler, access_log_sampler, add_logging_middleware, build_request_details
+from app.middleware.rate_limit import add_rate_limit_middleware, RateLimiter, rate_limiter
+from app.middleware.timeout import add_timeout_middleware
+import asyncio
+import logging
+import time
+
+class MiddlewarePipeline:
+    """
+    Pure-ASGI composition of the error handler, auth, timeout, rate limit and logging middleware.
+
+    Stages run in the same order as the BaseHTTPMiddleware stack they replace
+    (error handler outermost, logging innermost), but inside a single coroutine:
+    no per-layer task, response stream wrapping or extra call_next hop.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = None, timeout_seconds=10, sampler: AccessLogSampler = None):
+        self.app = app
+        self.rate_limiter = limiter or rate_limiter
+        self.access_log_sampler = sampler or access_log_sampler
+        self.timeout_seconds = timeout_seconds
+        self.error_logger = logging.getLogger("devanchor.middleware.error")
+        self.timeout_logger = logging.getLogger("devanchor.middleware.timeout")
+        self.http_logger = logging.getLogger("devanchor.middleware.http")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        deadline = None
+        response_started = False
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, status_code
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                # The timeout only guards time-to-first-byte, as asyncio.wait_for(call_next) did
+                if deadline is not None:
+                    deadline.reschedule(None)
+            await send(message)
+
+        try:
+            # Auth
+            await authenticate_request(request)
+
+            # Timeout
+            try:
+                async with asyncio.timeout(self.timeout_seconds) as deadline:
+                    # Rate limit
+                    await self.rate_limiter.check(request)
+
+                    # Logging (one sampled completion record per request)
+                    start_time = time.perf_counter()
+                    try:
+                        await self.app(scope, receive, send_wrapper)
+                    except Exception as e:
+                        duration = time.perf_counter() - start_time
+                        self.http_logger.error(
+                            "Request failed",
+                            extra={
+                                "request": build_request_details(request),
+                                "error": str(e),
+                                "duration_ms": round(duration * 1000, 2)
+                            },
+                            exc_info=True
+                        )
+                        raise
+                    self.access_log_sampler.log_completed(self.http_logger, request, status_code, start_time)
+            except TimeoutError:
+                if response_started:
+                    raise
+                self.timeout_logger.error(f"Request timeout after {self.timeout_seconds}s: {request.url}")
+                raise HTTPException(
+                    status_code=504,
+                    detail="Request Timeout"
+                )
+        except Exception as e:
+            # Error handler: once the response has started there is nothing left to replace
+            if response_started:
+                raise
+            response = build_error_response(e, request, self.error_logger)
+            await response(scope, receive, send)
+
+def add_middleware_pipeline(app):
+    app.add_middleware(MiddlewarePipeline)
+
+def add_middleware_stack(app, mode: str = None):
+    """
+    Install the full middleware stack.
+
+    "pipeline" (default) keeps Starlette's pure-ASGI CORS and GZip middleware and runs
+    everything else in one MiddlewarePipeline; "legacy" installs the original
+    BaseHTTPMiddleware layers one by one.
+    """
+    mode = mode or settings.MIDDLEWARE_MODE
+    if mode == "legacy":
+        add_cors_middleware(app)
+        add_logging_middleware(app)
+        add_gzip_middleware(app)
+        add_rate_limit_middleware(app)
+        add_timeout_middleware(app)
+        add_auth_middleware(app)
+        add_error_handler_middleware(app)
+    elif mode == "pipeline":
+        add_cors_middleware(app)
+        add_gzip_middleware(app)
+        add_middleware_pipeline(app)
+    else:
+        raise ValueError(f"Unknown middleware mode: {mode}")
@@ -1,42 +1,241 @@
 from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from app.config.settings import settings
+import asyncio
+import sqlite3
+import threading
 import time
 import logging
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, max_requests=100, window=60):
-        super().__init__(app)
-        self.max_requests = max_requests  # Maximum allowed requests
-        self.window = window  # Time window in seconds
-        self.request_counts = defaultdict(list)  # Track requests per IP
+def parse_route_costs(spec: str) -> Dict[Tuple[str, str], int]:
+    """Parse "POST /api/v1/users/login=5,POST /api/v1/book=2" into {(method, path): cost}."""
+    costs = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, cost = item.rpartition("=")
+        method, _, path = route.strip().partition(" ")
+        if not method or not path or not cost.strip().isdigit():
+            raise ValueError(f"Invalid rate limit route cost: {item!r}")
+        costs[(method.upper(), path.strip())] = int(cost)
+    return costs
+
+def slide_window(
+    counter: Optional[Tuple[int, int, int]], cost: int, now: float, window: float, max_requests: int
+) -> Tuple[bool, Tuple[int, int, int], float]:
+    """
+    Sliding-window-counter step shared by every storage backend.
+
+    `counter` is (window_index, current_count, previous_count) or None for a new key. The
+    load over the trailing window is the previous count weighted by how much of it still
+    overlaps, plus the current count. Returns (allowed, new counter, estimated load).
+    """
+    window_index = int(now // window)
+    if counter is None:
+        counter = (window_index, 0, 0)
+    elif counter[0] != window_index:
+        # Roll forward: the old current window becomes "previous" only if it is adjacent
+        counter = (window_index, 0, counter[1] if window_index - counter[0] == 1 else 0)
+
+    overlap = 1 - (now - window_index * window) / window
+    estimated = counter[2] * overlap + counter[1]
+    if estimated + cost > max_requests:
+        return False, counter, estimated
+    return True, (counter[0], counter[1] + cost, counter[2]), estimated + cost
+
+class SlidingWindowCounter:
+    """
+    In-process rate limit storage: O(1) time and memory per key.
+
+    Keys idle for two full windows carry no information and are swept every
+    `sweep_interval` seconds.
+    """
+    blocking = False
+
+    def __init__(self, max_requests: int, window: float, sweep_interval: float):
+        self.max_requests = max_requests
+        self.window = window
+        self.sweep_interval = sweep_interval
+        self._counters: Dict[str, Tuple[int, int, int]] = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def hit(self, key: str, cost: int = 1, now: Optional[float] = None) -> Tuple[bool, float]:
+        """Charge `cost` to `key`. Returns (allowed, estimated load including this hit if allowed)."""
+        now = time.monotonic() if now is None else now
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        allowed, counter, load = slide_window(self._counters.get(key), cost, now, self.window, self.max_requests)
+        self._counters[key] = counter
+        return allowed, load
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Forget keys whose last activity is older than the previous window."""
+        now = time.monotonic() if now is None else now
+        horizon = int(now // self.window) - 1
+        idle = [key for key, counter in self._counters.items() if counter[0] < horizon]
+        for key in idle:
+            del self._counters[key]
+        self._next_sweep = now + self.sweep_interval
+        return len(idle)
+
+    def key_count(self) -> int:
+        return len(self._counters)
+
+class SQLiteRateLimitStore:
+    """
+    Rate limit storage in a SQLite file shared by every worker process on the host.
+
+    Each hit is one short IMMEDIATE transaction, so concurrent workers charge a single
+    budget per key. Counters use wall-clock time because monotonic clocks are per process.
+    The store is blocking; callers run it on a dedicated thread.
+    """
+    blocking = True
+
+    def __init__(self, path: str, max_requests: int, window: float, sweep_interval: float, busy_timeout_ms: int = 2000):
+        self.path = path
+        self.max_requests = max_requests
+        self.window = window
+        self.sweep_interval = sweep_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._next_sweep = time.time() + sweep_interval
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, timeout=self.busy_timeout_ms / 1000)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")  # Counters are ephemeral; losing them on power loss is fine
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, window_index INTEGER NOT NULL, "
+                "current_count INTEGER NOT NULL, previous_count INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._local.connection = connection
+        return connection
+
+    def hit(self, key: str, cost: int = 1, now: Optional[float] = None) -> Tuple[bool, float]:
+        now = time.time() if now is None else now
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT window_index, current_count, previous_count FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            allowed, counter, load = slide_window(row, cost, now, self.window, self.max_requests)
+            if counter != row:
+                connection.execute(
+                    "INSERT INTO rate_limits (key, window_index, current_count, previous_count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET window_index = excluded.window_index, "
+                    "current_count = excluded.current_count, previous_count = excluded.previous_count",
+                    (key, *counter),
+                )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return allowed, load
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        self._next_sweep = now + self.sweep_interval
+        cursor = self._connection().execute(
+            "DELETE FROM rate_limits WHERE window_index < ?", (int(now // self.window) - 1,)
+        )
+        return cursor.rowcount
+
+    def key_count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+def create_rate_limit_store(
+    backend: str, max_requests: int, window: float, sweep_interval: float
+):
+    if backend == "memory":
+        return SlidingWindowCounter(max_requests=max_requests, window=window, sweep_interval=sweep_interval)
+    if backend == "sqlite":
+        return SQLiteRateLimitStore(
+            settings.RATE_LIMIT_SQLITE_PATH, max_requests=max_requests, window=window, sweep_interval=sweep_interval
+        )
+    raise ValueError(f"Unknown rate limit storage backend: {backend}")
+
+class RateLimiter:
+    """Applies the sliding-window budget per authenticated user (or per client IP) with per-route costs."""
+    def __init__(
+        self,
+        max_requests: int = settings.RATE_LIMIT_MAX_REQUESTS,
+        window: float = settings.RATE_LIMIT_WINDOW_SECONDS,
+        sweep_interval: float = settings.RATE_LIMIT_SWEEP_INTERVAL_SECONDS,
+        route_costs: Optional[Dict[Tuple[str, str], int]] = None,
+        key_by_user: bool = settings.RATE_LIMIT_KEY_BY_USER,
+        storage: str = settings.RATE_LIMIT_STORAGE,
+    ):
+        self.store = create_rate_limit_store(storage, max_requests, window, sweep_interval)
+        self.storage = storage
+        self.route_costs = parse_route_costs(settings.RATE_LIMIT_ROUTE_COSTS) if route_costs is None else route_costs
+        self.key_by_user = key_by_user
+        # Blocking stores get one dedicated thread so their connection never crosses threads
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit") if self.store.blocking else None
+        self.allowed = 0
+        self.rejected = 0
         self.logger = logging.getLogger("devanchor.middleware.rate_limit")
 
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        current_time = time.time()
-        
-        # Remove requests outside the time window
-        self.request_counts[client_ip] = [
-            t for t in self.request_counts[client_ip]
-            if current_time - t < self.window
-        ]
-        
-        # Enforce rate limit
-        if len(self.request_counts[client_ip]) >= self.max_requests:
-            self.logger.warning(f"Rate limit exceeded for IP: {client_ip}")
+    def key_for(self, request: Request) -> str:
+        user_id = getattr(request.state, "user_id", None) if self.key_by_user else None
+        return f"user:{user_id}" if user_id else f"ip:{request.client.host}"
+
+    async def check(self, request: Request) -> None:
+        """Charge the request to its key, raising 429 if that key is over budget."""
+        key = self.key_for(request)
+        cost = self.route_costs.get((request.method, request.url.path), 1)
+
+        if self._executor is None:
+            allowed, load = self.store.hit(key, cost)
+        else:
+            allowed, load = await asyncio.get_running_loop().run_in_executor(self._executor, self.store.hit, key, cost)
+
+        if not allowed:
+            self.rejected += 1
+            self.logger.warning(f"Rate limit exceeded for {key}")
             raise HTTPException(
                 status_code=429,
                 detail="Too Many Requests"
             )
-        
-        # Record current request timestamp
-        self.request_counts[client_ip].append(current_time)
-        self.logger.debug(f"Request count for {client_ip}: {len(self.request_counts[client_ip])}")
-        
+        self.allowed += 1
+        self.logger.debug(f"Request load for {key}: {load:.1f}")
+
+    async def stats(self) -> dict:
+        if self._executor is None:
+            keys = self.store.key_count()
+        else:
+            # Blocking stores are only touched from their own thread, never from the event loop
+            keys = await asyncio.get_running_loop().run_in_executor(self._executor, self.store.key_count)
+        return {
+            "storage": self.storage,
+            "keys": keys,
+            "max_requests": self.store.max_requests,
+            "window_seconds": self.store.window,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+rate_limiter = RateLimiter()
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, limiter: RateLimiter = None):
+        super().__init__(app)
+        self.limiter = limiter or rate_limiter
+
+    async def dispatch(self, request: Request, call_next):
+        await self.limiter.check(request)
+
         # Process request
         response = await call_next(request)
         return response
 
 def add_rate_limit_middleware(app):
-    app.add_middleware(RateLimitMiddleware)
\ No newline at end of file
+    app.add_middleware(RateLimitMiddleware)
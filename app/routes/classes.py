@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, Query
+from typing import Optional
 from app.schemas.classes import ClassCreate, ClassResponse, PaginatedClassResponse
 from app.services.classes import create_class, get_all_classes
-from app.middleware.auth import get_current_user
+from app.middleware.auth import get_current_user, get_current_user_id
 from app.database.models.users import User
 
 router = APIRouter()
@@ -18,6 +19,10 @@ async def get_all_classes_endpoint(
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     limit: int = Query(10, ge=1, le=100, description="Number of items per page (max 100)"),
     timezone: str = Query("Asia/Kolkata", description="Client timezone (e.g., America/New_York)"),
-    user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="next_cursor or prev_cursor from a previous page; overrides page"),
+    include_total: Optional[bool] = Query(None, description="Count all classes (default: true in page mode, false with a cursor)"),
+    user_id: str = Depends(get_current_user_id)
 ):
-    return await get_all_classes(page=page, limit=limit, timezone=timezone)
\ No newline at end of file
+    return await get_all_classes(
+        page=page, limit=limit, timezone=timezone, cursor=cursor, include_total=include_total
+    )
\ No newline at end of file
@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+from app.auth.principal_cache import principal_cache
+from app.auth.authz_epochs import authz_epochs
+from app.utils.jwt_utils import decode_cache
+from app.middleware.rate_limit import rate_limiter
+from app.services.catalog_cache import catalog_cache
+from app.services.bookings import booking_writer
+from app.utils.password_utils import password_hasher
+from app.services.maintenance import maintenance_scheduler
+from app.utils.startup_profile import startup_profile
+from app.logging.config import log_queue_stats
+from app.middleware.logger import access_log_sampler
+import logging
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+logger = logging.getLogger("devanchor.routes.metrics")
+
+@router.get("")
+async def get_metrics():
+    logger.info("GET request for runtime metrics")
+    return {
+        "principal_cache": principal_cache.stats(),
+        "authz_epochs": authz_epochs.stats(),
+        "jwt_decode_cache": decode_cache.stats(),
+        "rate_limiter": await rate_limiter.stats(),
+        "class_listing_cache": catalog_cache.stats(),
+        "booking_group_commit": booking_writer.stats(),
+        "password_hasher": password_hasher.stats(),
+        "maintenance": maintenance_scheduler.stats(),
+        "startup": startup_profile.stats(),
+        "logging": log_queue_stats(),
+        "access_log": access_log_sampler.stats(),
+    }
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from app.database.models.enums import RecordStatus
 import pendulum
 from app.utils.constants import ClassesBooking
@@ -42,7 +42,9 @@ class ClassResponse(BaseModel):
 
 class PaginatedClassResponse(BaseModel):
     items: List[ClassResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # Omitted in cursor mode unless include_total=true
+    page: Optional[int] = None  # Only set in page mode
     limit: int
-    total_pages: int
\ No newline at end of file
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Opaque token for the following page, absent on the last page
+    prev_cursor: Optional[str] = None  # Opaque token for the preceding page, absent on the first page
\ No newline at end of file
@@ -2,66 +2,95 @@ from app.database.models.bookings import Booking
 from app.database.models.classes import Class
 from app.database.models.users import User
 from app.schemas.bookings import BookingCreate, BookingResponse
+from app.services.catalog_cache import catalog_cache
 from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F
 from tortoise.transactions import in_transaction
+from app.database.connection import WRITE_CONNECTION, read_connection
+from app.database.group_commit import GroupCommitWriter
+from app.config.settings import settings
 from fastapi import HTTPException
 from app.utils.constants import ErrorMessages, ClassesBooking
+from app.utils.timezones import format_schedule, format_schedules, resolve_timezone
+from typing import Tuple
 import logging
 import pendulum
 
 logger = logging.getLogger("devanchor.services.bookings")
 
+# Opt-in: coalesce concurrent bookings into one transaction per BOOKING_GROUP_COMMIT_WINDOW_MS
+booking_writer = GroupCommitWriter(
+    WRITE_CONNECTION,
+    window_ms=settings.BOOKING_GROUP_COMMIT_WINDOW_MS,
+    max_batch=settings.BOOKING_GROUP_COMMIT_MAX_BATCH,
+    enabled=settings.BOOKING_GROUP_COMMIT_ENABLED,
+)
+
+async def _reserve_booking(booking_data: BookingCreate, user: User) -> Tuple[Class, Booking]:
+    """
+    Validate the class and request, reserve a slot and insert the booking. Runs inside the
+    caller's transaction: its own, or a group-commit batch's savepoint.
+    """
+    # Validate class
+    class_instance = await Class.get_or_none(id=booking_data.class_id)
+    if not class_instance or class_instance.status != "active":
+        logger.warning(f"Class not found or inactive: {booking_data.class_id}")
+        raise HTTPException(status_code=404, detail=ErrorMessages.NOT_FOUND)
+
+    # Check booking deadline (30 minutes before class start)
+    ist = resolve_timezone(ClassesBooking.DEFAULT_TIMEZONE)
+    class_start = class_instance.schedule.astimezone(ist)
+    now = pendulum.now(ist)
+    if class_start <= now.add(minutes=30):
+        logger.warning(f"Booking deadline passed for class: {booking_data.class_id}")
+        raise HTTPException(status_code=400, detail=ErrorMessages.BOOKING_DEADLINE_PASSED)
+
+    # Validate client email matches authenticated user
+    if booking_data.client_email != user.email:
+        logger.warning(f"Email mismatch: {booking_data.client_email} != {user.email}")
+        raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_REQUEST)
+
+    # Reserve a slot: one conditional UPDATE, so concurrent writers can never oversell
+    reserved = await Class.filter(
+        id=class_instance.id, status="active", booked_count__lt=F("slots")
+    ).update(booked_count=F("booked_count") + 1)
+    if not reserved:
+        logger.warning(f"No slots available for class: {booking_data.class_id}")
+        raise HTTPException(status_code=400, detail="No slots available for this class.")
+
+    # Create booking
+    booking = await Booking.create(
+        user=user,
+        class_=class_instance,
+        status="active"
+    )
+    logger.info(f"Booking created for class {booking_data.class_id} by user {user.email}")
+    return class_instance, booking
+
 async def create_booking(booking_data: BookingCreate, user: User, timezone: str = ClassesBooking.DEFAULT_TIMEZONE) -> BookingResponse:
     try:
         # Validate timezone
         try:
-            tz = pendulum.timezone(timezone)
+            tz = resolve_timezone(timezone)
         except pendulum.exceptions.InvalidTimezone:
             logger.warning(f"Invalid timezone: {timezone}")
             raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_TIMEZONE)
 
-        async with in_transaction():
-            # Validate class
-            class_instance = await Class.get_or_none(id=booking_data.class_id)
-            if not class_instance or class_instance.status != "active":
-                logger.warning(f"Class not found or inactive: {booking_data.class_id}")
-                raise HTTPException(status_code=404, detail=ErrorMessages.NOT_FOUND)
-
-            # Check booking deadline (30 minutes before class start)
-            ist = pendulum.timezone(ClassesBooking.DEFAULT_TIMEZONE)
-            class_start = class_instance.schedule.astimezone(ist)
-            now = pendulum.now(ist)
-            if class_start <= now.add(minutes=30):
-                logger.warning(f"Booking deadline passed for class: {booking_data.class_id}")
-                raise HTTPException(status_code=400, detail=ErrorMessages.BOOKING_DEADLINE_PASSED)
-
-            # Check available slots
-            active_bookings = await Booking.filter(class_=class_instance, status="active").count()
-            if active_bookings >= class_instance.slots:
-                logger.warning(f"No slots available for class: {booking_data.class_id}")
-                raise HTTPException(status_code=400, detail="No slots available for this class.")
-
-            # Validate client email matches authenticated user
-            if booking_data.client_email != user.email:
-                logger.warning(f"Email mismatch: {booking_data.client_email} != {user.email}")
-                raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_REQUEST)
-
-            # Create booking
-            booking = await Booking.create(
-                user=user,
-                class_=class_instance,
-                status="active"
-            )
-            logger.info(f"Booking created for class {booking_data.class_id} by user {user.email}")
+        if booking_writer.enabled:
+            class_instance, booking = await booking_writer.submit(_reserve_booking, booking_data, user)
+        else:
+            async with in_transaction(WRITE_CONNECTION):
+                class_instance, booking = await _reserve_booking(booking_data, user)
+        catalog_cache.bump()  # Availability shown in class listings changed
 
         # Construct response in client's timezone
-        schedule_tz = class_instance.schedule.astimezone(tz)
+        class_date, class_time = format_schedule(class_instance.schedule, tz)
         return BookingResponse(
             id=booking.id,
             class_id=class_instance.id,
             class_name=class_instance.name,
-            class_date=schedule_tz.date().isoformat(),
-            class_time=schedule_tz.time().isoformat(),
+            class_date=class_date,
+            class_time=class_time,
             client_name=booking_data.client_name,
             client_email=booking_data.client_email,
             status=booking.status,
@@ -80,31 +109,31 @@ async def get_user_bookings(user: User, timezone: str = ClassesBooking.DEFAULT_T
     try:
         # Validate timezone
         try:
-            tz = pendulum.timezone(timezone)
+            tz = resolve_timezone(timezone)
         except pendulum.exceptions.InvalidTimezone:
             logger.warning(f"Invalid timezone: {timezone}")
             raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_TIMEZONE)
 
-        async with in_transaction():
-            bookings = await Booking.filter(user=user, status="active").prefetch_related("class_")
+        bookings = await Booking.filter(user=user, status="active").using_db(read_connection()).prefetch_related("class_")
 
         if not bookings:
             logger.info(f"No bookings found for user: {user.email}")
             return []
 
+        schedules = format_schedules((booking.class_.schedule for booking in bookings), tz)
         responses = [
             BookingResponse(
                 id=booking.id,
                 class_id=booking.class_.id,
                 class_name=booking.class_.name,
-                class_date=booking.class_.schedule.astimezone(tz).date().isoformat(),
-                class_time=booking.class_.schedule.astimezone(tz).time().isoformat(),
+                class_date=class_date,
+                class_time=class_time,
                 client_name=user.username,
                 client_email=user.email,
                 status=booking.status,
                 timezone=timezone
             )
-            for booking in bookings
+            for booking, (class_date, class_time) in zip(bookings, schedules)
         ]
         logger.info(f"Fetched {len(bookings)} bookings for user: {user.email}")
         return responses
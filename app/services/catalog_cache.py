@@ -0,0 +1,50 @@
+from typing import Hashable, Optional
+from app.config.settings import settings
+from app.schemas.classes import PaginatedClassResponse
+from app.utils.ttl_cache import TTLCache
+import logging
+
+logger = logging.getLogger("devanchor.services.catalog_cache")
+
+class CatalogCache:
+    """
+    Per-process LRU cache of class listing pages, keyed by the catalog version plus the
+    listing parameters.
+
+    Writers that change what a listing shows (new classes, new bookings) call `bump()`.
+    Because a reader captures the version before it queries, a page computed across a
+    bump is stored under the old version and never served. The TTL bounds how long a
+    page can miss bumps made by other worker processes.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, enabled: bool = True):
+        self.enabled = enabled
+        self.version = 0
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def key(self, *params: Hashable) -> tuple:
+        return (self.version, *params)
+
+    def get(self, key: tuple) -> Optional[PaginatedClassResponse]:
+        if not self.enabled:
+            return None
+        return self._cache.get(key)
+
+    def set(self, key: tuple, page: PaginatedClassResponse) -> None:
+        if self.enabled and key[0] == self.version:
+            self._cache.set(key, page)
+
+    def bump(self) -> None:
+        """Invalidate every cached page."""
+        self.version += 1
+        self._cache.clear()
+        logger.debug(f"Catalog version bumped to {self.version}")
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "version": self.version, **self._cache.stats()}
+
+catalog_cache = CatalogCache(
+    max_size=settings.CLASS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.CLASS_CACHE_TTL_SECONDS,
+    enabled=settings.CLASS_CACHE_ENABLED,
+)
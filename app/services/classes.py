@@ -1,11 +1,16 @@
 from app.database.models.classes import Class
-from app.database.models.bookings import Booking
 from app.database.models.users import User
 from app.schemas.classes import ClassCreate, ClassResponse, PaginatedClassResponse
+from app.services.catalog_cache import catalog_cache
 from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Q
 from tortoise.transactions import in_transaction
+from app.database.connection import WRITE_CONNECTION, read_connection_name
 from fastapi import HTTPException
 from app.utils.constants import ErrorMessages, ClassesBooking
+from app.utils.pagination import NEXT, PREV, decode_cursor, encode_cursor
+from app.utils.timezones import UTC, format_schedule, format_schedules, resolve_timezone
+from typing import Optional
 import logging
 from math import ceil
 import pendulum
@@ -15,16 +20,16 @@ logger = logging.getLogger("devanchor.services.classes")
 async def create_class(class_data: ClassCreate, user: User) -> ClassResponse:
     try:
         # Validate schedule is in the future
-        ist = pendulum.timezone(ClassesBooking.DEFAULT_TIMEZONE)
+        ist = resolve_timezone(ClassesBooking.DEFAULT_TIMEZONE)
         now = pendulum.now(ist)
         if class_data.schedule <= now:
             logger.warning(f"Invalid schedule: {class_data.schedule} is not in the future")
             raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_SCHEDULE)
 
         # Convert schedule to UTC for storage
-        schedule_utc = class_data.schedule.astimezone(pendulum.timezone("UTC"))
+        schedule_utc = class_data.schedule.astimezone(UTC)
 
-        async with in_transaction():
+        async with in_transaction(WRITE_CONNECTION):
             # Create class with authenticated user as instructor
             class_instance = await Class.create(
                 name=class_data.name,
@@ -34,14 +39,15 @@ async def create_class(class_data: ClassCreate, user: User) -> ClassResponse:
                 status="active"
             )
             logger.info(f"Class created: {class_data.name} by instructor {user.username}")
+        catalog_cache.bump()
 
         # Construct response in IST
-        schedule_ist = class_instance.schedule.astimezone(ist)
+        class_date, class_time = format_schedule(class_instance.schedule, ist)
         return ClassResponse(
             id=class_instance.id,
             name=class_instance.name,
-            date=schedule_ist.date().isoformat(),
-            time=schedule_ist.time().isoformat(),
+            date=class_date,
+            time=class_time,
             instructor=user.username,
             available_slots=class_instance.slots,
             status=class_instance.status,
@@ -56,7 +62,33 @@ async def create_class(class_data: ClassCreate, user: User) -> ClassResponse:
         logger.error(f"Error creating class: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=ErrorMessages.INTERNAL_SERVER_ERROR)
 
-async def get_all_classes(page: int = 1, limit: int = 10, timezone: str = ClassesBooking.DEFAULT_TIMEZONE) -> PaginatedClassResponse:
+async def get_all_classes(
+    page: int = 1,
+    limit: int = 10,
+    timezone: str = ClassesBooking.DEFAULT_TIMEZONE,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+) -> PaginatedClassResponse:
+    """
+    List classes ordered by (schedule, id).
+
+    Without a cursor this is classic page/offset pagination. With a `next_cursor` or
+    `prev_cursor` from a previous response it seeks straight to the neighbouring page on
+    the schedule index, so every page costs the same however deep it is. The total count
+    is computed by default only in page mode; pass `include_total` to override.
+    """
+    cache_key = catalog_cache.key(page, cursor, limit, timezone, include_total)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    response = await _load_classes(page, limit, timezone, cursor, include_total)
+    catalog_cache.set(cache_key, response)
+    return response
+
+async def _load_classes(
+    page: int, limit: int, timezone: str, cursor: Optional[str], include_total: Optional[bool]
+) -> PaginatedClassResponse:
     try:
         # Validate pagination parameters
         if page < 1:
@@ -68,47 +100,76 @@ async def get_all_classes(page: int = 1, limit: int = 10, timezone: str = Classe
 
         # Validate timezone
         try:
-            tz = pendulum.timezone(timezone)
+            tz = resolve_timezone(timezone)
         except pendulum.exceptions.InvalidTimezone:
             logger.warning(f"Invalid timezone: {timezone}")
             raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_TIMEZONE)
 
-        # Calculate offset
-        offset = (page - 1) * limit
+        # Validate cursor
+        direction = None
+        if cursor:
+            try:
+                direction, key_schedule, key_id = decode_cursor(cursor)
+            except ValueError:
+                logger.warning(f"Invalid cursor: {cursor}")
+                raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_CURSOR)
+        if include_total is None:
+            include_total = direction is None
+
+        # One query for the page with the instructor joined; availability comes from the
+        # denormalized booked_count that create_booking maintains, so bookings are not read.
+        # One extra row is fetched to learn whether another page follows in the paging direction.
+        query = Class.all().select_related("instructor")
+        if direction == NEXT:
+            query = query.filter(
+                Q(schedule__gt=key_schedule) | Q(schedule=key_schedule, id__gt=key_id)
+            ).order_by("schedule", "id")
+        elif direction == PREV:
+            query = query.filter(
+                Q(schedule__lt=key_schedule) | Q(schedule=key_schedule, id__lt=key_id)
+            ).order_by("-schedule", "-id")
+        else:
+            query = query.order_by("schedule", "id").offset((page - 1) * limit)
 
-        async with in_transaction():
-            # Fetch total count and paginated classes
-            total = await Class.all().count()
-            classes = await Class.all().prefetch_related("instructor", "bookings").offset(offset).limit(limit)
+        # Count and page share one read snapshot on a read-only connection
+        async with in_transaction(read_connection_name()) as connection:
+            total = await Class.all().using_db(connection).count() if include_total else None
+            classes = await query.using_db(connection).limit(limit + 1)
 
-        if not classes:
+        has_more = len(classes) > limit
+        classes = classes[:limit]
+        if direction == PREV:
+            classes.reverse()
+
+        # Work out which neighbouring pages exist
+        if direction == NEXT:
+            has_next, has_prev = has_more, True
+        elif direction == PREV:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, page > 1
+        next_cursor = prev_cursor = None
+        if classes:
+            if has_next:
+                next_cursor = encode_cursor(NEXT, classes[-1].schedule, classes[-1].id)
+            if has_prev:
+                prev_cursor = encode_cursor(PREV, classes[0].schedule, classes[0].id)
+        else:
             logger.info("No classes found")
-            return PaginatedClassResponse(
-                items=[],
-                total=0,
-                page=page,
-                limit=limit,
-                total_pages=0
-            )
 
-        # Construct response
+        # Construct response, converting all schedules to the client's timezone in one pass
         responses = []
-        for class_instance in classes:
+        schedules = format_schedules((class_instance.schedule for class_instance in classes), tz)
+        for class_instance, (class_date, class_time) in zip(classes, schedules):
             # Calculate available slots
-            active_bookings = await Booking.filter(
-                class_=class_instance.id,
-                status="active"
-            ).count()
-            available_slots = class_instance.slots - active_bookings
+            available_slots = class_instance.slots - class_instance.booked_count
 
-            # Convert schedule to client's timezone
-            schedule_tz = class_instance.schedule.astimezone(tz)
             responses.append(
                 ClassResponse(
                     id=class_instance.id,
                     name=class_instance.name,
-                    date=schedule_tz.date().isoformat(),
-                    time=schedule_tz.time().isoformat(),
+                    date=class_date,
+                    time=class_time,
                     instructor=class_instance.instructor.username,
                     available_slots=available_slots,
                     status=class_instance.status,
@@ -116,16 +177,18 @@ async def get_all_classes(page: int = 1, limit: int = 10, timezone: str = Classe
                 )
             )
 
-        logger.info(f"Fetched {len(classes)} classes for page {page}, limit {limit}, timezone {timezone}")
+        logger.info(f"Fetched {len(classes)} classes for {'cursor' if direction else f'page {page}'}, limit {limit}, timezone {timezone}")
         return PaginatedClassResponse(
             items=responses,
             total=total,
-            page=page,
+            page=None if direction else page,
             limit=limit,
-            total_pages=ceil(total / limit)
+            total_pages=ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor
         )
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching classes: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=ErrorMessages.INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=ErrorMessages.INTERNAL_SERVER_ERROR)
@@ -0,0 +1,253 @@
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+from tortoise.expressions import Q, Subquery
+from tortoise.transactions import in_transaction
+from app.config.settings import settings
+from app.database.connection import WRITE_CONNECTION, get_db_config
+from app.database.models.bookings import Booking
+from app.database.models.bookings_archive import BookingArchive
+from app.database.models.classes import Class
+from app.database.models.enums import RecordStatus
+from app.database.models.refresh_tokens import RefreshToken
+from app.services.catalog_cache import catalog_cache
+import asyncio
+import logging
+import os
+import random
+import time
+
+logger = logging.getLogger("devanchor.services.maintenance")
+
+class MaintenanceJob:
+    """A periodic job: an async callable returning the number of rows it touched."""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[int]], interval_seconds: float):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.runs = 0
+        self.failures = 0
+        self.rows_total = 0
+        self.last_rows = 0
+        self.last_duration_ms = 0.0
+        self.last_run_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "failures": self.failures,
+            "rows_total": self.rows_total,
+            "last_rows": self.last_rows,
+            "last_duration_ms": self.last_duration_ms,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+        }
+
+class MaintenanceScheduler:
+    """
+    In-process asyncio scheduler for housekeeping jobs.
+
+    Only one worker per host runs the jobs: the one holding an exclusive flock on
+    `lock_path` (next to the database), which it keeps for its lifetime. The other workers
+    retry the lock every `lock_retry_seconds`, so if the holder exits one of them takes
+    over. Without a lock path (in-memory database) every process runs its own jobs.
+
+    Each job runs on its own task. The first run lands at a random point within the first
+    interval and later runs are spaced by the interval +/- `jitter`. Jobs are idempotent
+    and work in bounded batches, so a run cut short by a takeover is simply continued.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        jitter: float = 0.1,
+        lock_path: Optional[str] = None,
+        lock_retry_seconds: float = 30.0,
+    ):
+        self.enabled = enabled
+        self.jitter = jitter
+        self.lock_path = lock_path
+        self.lock_retry_seconds = lock_retry_seconds
+        self.jobs: Dict[str, MaintenanceJob] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._runner: Optional[asyncio.Task] = None
+        self._lock_file = None
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[int]], interval_seconds: float) -> None:
+        self.jobs[name] = MaintenanceJob(name, func, interval_seconds)
+
+    async def run_job(self, name: str) -> int:
+        """Run one job now and record its runtime and rows touched; failures are logged, not raised."""
+        job = self.jobs[name]
+        start = time.perf_counter()
+        job.last_run_at = datetime.now(timezone.utc).isoformat()
+        try:
+            rows = await job.func()
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"Maintenance job {name} failed: {e}", exc_info=True)
+            rows = 0
+        else:
+            job.last_error = None
+            if rows:
+                logger.info(f"Maintenance job {name} touched {rows} row(s)")
+        job.runs += 1
+        job.last_rows = rows
+        job.rows_total += rows
+        job.last_duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        return rows
+
+    async def _loop(self, job: MaintenanceJob) -> None:
+        delay = random.uniform(0, job.interval_seconds)
+        while True:
+            await asyncio.sleep(delay)
+            await self.run_job(job.name)
+            delay = job.interval_seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _try_lock(self) -> bool:
+        """Take the host-wide maintenance lock without blocking; True if this process now holds it."""
+        if self.lock_path is None:
+            return True
+        try:
+            import fcntl  # POSIX only
+        except ImportError:
+            return True
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file  # Held (open) until stop() or process exit
+        return True
+
+    def _release_lock(self) -> None:
+        if self._lock_file is not None:
+            self._lock_file.close()  # Closing the descriptor releases the flock
+            self._lock_file = None
+
+    async def _run(self) -> None:
+        while not self._try_lock():
+            await asyncio.sleep(self.lock_retry_seconds)
+        self._tasks = [
+            asyncio.create_task(self._loop(job), name=f"maintenance:{job.name}")
+            for job in self.jobs.values()
+            if job.interval_seconds > 0
+        ]
+        logger.info(f"Maintenance scheduler running {len(self._tasks)} job(s) in this worker (pid {os.getpid()})")
+
+    def start(self) -> None:
+        if not self.enabled or self._runner is not None:
+            return
+        self._runner = asyncio.create_task(self._run(), name="maintenance:lock")
+
+    async def stop(self) -> None:
+        tasks = [task for task in (self._runner, *self._tasks) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._runner = None
+        self._tasks = []
+        self._release_lock()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": bool(self._tasks),
+            "lock_path": self.lock_path,
+            "jobs": {name: job.stats() for name, job in self.jobs.items()},
+        }
+
+async def _in_batches(step: Callable[[int], Awaitable[int]], batch_size: int, max_batches: int) -> int:
+    """
+    Call `step(batch_size)` until it touches fewer than `batch_size` rows or `max_batches`
+    batches ran. Each batch is its own short write, and the event loop gets a turn between
+    batches, so a large backlog never holds the SQLite write lock or the loop for long.
+    """
+    total = 0
+    for _ in range(max_batches):
+        rows = await step(batch_size)
+        total += rows
+        if rows < batch_size:
+            break
+        await asyncio.sleep(0)
+    return total
+
+def purgeable_refresh_tokens(now: datetime):
+    """
+    Refresh tokens that can never be used again: revoked, or expired under any other status.
+    Both branches lead with `status`, so each is a range search on the (status, expiresAt)
+    index rather than a scan of the table.
+    """
+    unrevoked = [status.value for status in RecordStatus if status is not RecordStatus.revoked]
+    return RefreshToken.filter(Q(status=RecordStatus.revoked) | Q(status__in=unrevoked, expiresAt__lt=now))
+
+async def purge_refresh_tokens() -> int:
+    """Delete refresh tokens that can never be used again: revoked or expired."""
+    now = datetime.now(timezone.utc)
+
+    async def step(batch_size: int) -> int:
+        ids = await purgeable_refresh_tokens(now).limit(batch_size).values_list("id", flat=True)
+        if ids:
+            await RefreshToken.filter(id__in=ids).delete()
+        return len(ids)
+
+    return await _in_batches(step, settings.MAINTENANCE_BATCH_SIZE, settings.MAINTENANCE_MAX_BATCHES)
+
+async def deactivate_past_classes() -> int:
+    """Mark classes that have already started as inactive."""
+    rows = await Class.filter(status="active", schedule__lt=datetime.now(timezone.utc)).update(status="inactive")
+    if rows:
+        catalog_cache.bump()  # Listings show each class's status
+    return rows
+
+async def archive_old_bookings() -> int:
+    """Move bookings of classes older than BOOKING_ARCHIVE_AFTER_DAYS into bookings_archive."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.BOOKING_ARCHIVE_AFTER_DAYS)
+
+    async def step(batch_size: int) -> int:
+        # Copy and delete in one transaction, so a row is always in exactly one of the tables
+        async with in_transaction(WRITE_CONNECTION) as connection:
+            rows = await Booking.filter(
+                class__id__in=Subquery(Class.filter(schedule__lt=cutoff).values("id"))
+            ).using_db(connection).limit(batch_size).values(
+                "id", "user_id", "class__id", "status", "createdAt", "updatedAt"
+            )
+            if not rows:
+                return 0
+            await BookingArchive.bulk_create(
+                [
+                    BookingArchive(
+                        id=row["id"],
+                        user_id=row["user_id"],
+                        class_id=row["class__id"],
+                        status=row["status"],
+                        createdAt=row["createdAt"],
+                        updatedAt=row["updatedAt"],
+                    )
+                    for row in rows
+                ],
+                using_db=connection,
+            )
+            await Booking.filter(id__in=[row["id"] for row in rows]).using_db(connection).delete()
+        return len(rows)
+
+    # Listings read availability from classes.booked_count, which archiving leaves alone
+    return await _in_batches(step, settings.MAINTENANCE_BATCH_SIZE, settings.MAINTENANCE_MAX_BATCHES)
+
+def maintenance_lock_path() -> Optional[str]:
+    db_file = get_db_config()["DB_FILE"]
+    return None if not db_file or db_file == ":memory:" else f"{os.path.abspath(db_file)}.maintenance.lock"
+
+maintenance_scheduler = MaintenanceScheduler(
+    enabled=settings.MAINTENANCE_ENABLED,
+    jitter=settings.MAINTENANCE_JITTER,
+    lock_path=maintenance_lock_path(),
+    lock_retry_seconds=settings.MAINTENANCE_LOCK_RETRY_SECONDS,
+)
+maintenance_scheduler.add_job("purge_refresh_tokens", purge_refresh_tokens, settings.TOKEN_PURGE_INTERVAL_SECONDS)
+maintenance_scheduler.add_job("deactivate_past_classes", deactivate_past_classes, settings.CLASS_DEACTIVATE_INTERVAL_SECONDS)
+maintenance_scheduler.add_job("archive_old_bookings", archive_old_bookings, settings.BOOKING_ARCHIVE_INTERVAL_SECONDS)
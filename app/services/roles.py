@@ -4,6 +4,8 @@ from typing import List, Optional
 from app.database.models.roles import Role
 from app.schemas.roles import RoleCreate, RoleUpdate, RoleResponse
 from app.utils.constants import ErrorMessages, RoleConstants
+from app.database.models.user_roles import UserRole
+from app.auth.authz_epochs import bump_authz_epoch
 import logging
 
 logger = logging.getLogger("devanchor.services.roles")
@@ -49,6 +51,7 @@ async def update_role(role_id: str, role_data: RoleUpdate) -> Role:
         update_dict = role_data.dict(exclude_unset=True)
         if update_dict:
             await role.update_from_dict(update_dict).save()
+            await bump_authz_epoch(await UserRole.filter(role_id=role.id).values_list("user_id", flat=True))
             logger.info(f"Updated role: {role.name}", extra={"role_id": role.id, "updated_fields": list(update_dict.keys())})
         else:
             logger.debug(f"No updates provided for role: {role_id}")
@@ -68,7 +71,10 @@ async def delete_role(role_id: str) -> None:
             logger.warning(f"Role not found: {role_id}")
             raise HTTPException(status_code=404, detail=ErrorMessages.NOT_FOUND)
 
+        # Collect holders before the cascade removes their user_roles rows
+        holder_ids = await UserRole.filter(role_id=role.id).values_list("user_id", flat=True)
         await role.delete()
+        await bump_authz_epoch(holder_ids)
         logger.info(f"Deleted role: {role.name}", extra={"role_id": role.id})
     except Exception as e:
         logger.error(f"Error deleting role {role_id}: {str(e)}", exc_info=True)
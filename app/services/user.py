@@ -4,19 +4,56 @@ from app.database.models.roles import Role
 from app.database.models.user_roles import UserRole
 from app.schemas.user import UserCreate, UserLogin, UserUpdate, UserResponse, RoleResponse, RefreshRequest
 from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Subquery
+from tortoise.transactions import in_transaction
+from app.database.connection import WRITE_CONNECTION
+from tortoise import BaseDBAsyncClient
 from fastapi import HTTPException
-from app.utils.password_utils import get_password_hash, verify_password
-from app.utils.jwt_utils import create_access_token, create_refresh_token, decode_token
+from app.utils.password_utils import get_password_hash_async, verify_and_update_password_async
+from app.utils.jwt_utils import build_access_claims, create_access_token, create_refresh_token, decode_token, hash_refresh_token
 from datetime import datetime, timedelta, timezone
 from app.utils.constants import ErrorMessages
+from app.auth.principal_cache import principal_cache
+from app.auth.authz_epochs import bump_authz_epoch
+from app.config.settings import settings
+from typing import Optional
 import logging
 
 logger = logging.getLogger("devanchor.services.users")
 
+async def _issue_refresh_token(user: User, connection: Optional[BaseDBAsyncClient] = None) -> str:
+    """
+    Mint a refresh token and store its digest, then evict the user's oldest active
+    sessions beyond REFRESH_TOKEN_MAX_SESSIONS. Runs on `connection` when given.
+    """
+    refresh_token = create_refresh_token({"sub": str(user.id)})
+    await RefreshToken.create(
+        user=user,
+        token_hash=hash_refresh_token(refresh_token),
+        expiresAt=datetime.now(timezone.utc) + timedelta(days=7),
+        revoked=datetime.now(timezone.utc) + timedelta(days=30),
+        status="active",
+        using_db=connection
+    )
+
+    if settings.REFRESH_TOKEN_MAX_SESSIONS > 0:
+        # One DELETE: everything past the newest REFRESH_TOKEN_MAX_SESSIONS active sessions
+        evicted = await RefreshToken.filter(
+            id__in=Subquery(
+                RefreshToken.filter(user_id=user.id, status="active")
+                .order_by("-createdAt", "-id")
+                .offset(settings.REFRESH_TOKEN_MAX_SESSIONS)
+                .values("id")
+            )
+        ).using_db(connection).delete()
+        if evicted:
+            logger.info(f"Evicted {evicted} oldest session(s) for user: {user.email}")
+    return refresh_token
+
 async def create_user(user_data: UserCreate) -> UserResponse:
     try:
         user_dict = user_data.dict()
-        user_dict["passwordHash"] = get_password_hash(user_dict.pop("password"))  # Hash the password
+        user_dict["passwordHash"] = await get_password_hash_async(user_dict.pop("password"))  # Hash the password
 
         user = await User.create(**user_dict)
         logger.info(f"User created: {user.email}")
@@ -35,17 +72,10 @@ async def create_user(user_data: UserCreate) -> UserResponse:
         logger.info(f"Assigned 'client' role to user: {user.email}")
 
         # Generate access token
-        access_token = create_access_token({"sub": str(user.id)})
+        access_token = create_access_token(build_access_claims(str(user.id), [client_role.name], user.authzEpoch))
 
         # Generate and store refresh token
-        refresh_token = create_refresh_token({"sub": str(user.id)})
-        await RefreshToken.create(
-            user=user,
-            token=refresh_token,
-            expiresAt=datetime.now(timezone.utc) + timedelta(days=7),
-            revoked=datetime.now(timezone.utc) + timedelta(days=30),
-            status="active"
-        )
+        refresh_token = await _issue_refresh_token(user)
         logger.info(f"Tokens generated for user: {user.email}")
 
         # Fetch roles for response
@@ -74,6 +104,8 @@ async def create_user(user_data: UserCreate) -> UserResponse:
     except IntegrityError:
         logger.warning(f"Duplicate email or username: {user_data.email}, {user_data.username}")
         raise HTTPException(status_code=409, detail=ErrorMessages.CONFLICT)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating user: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=ErrorMessages.INTERNAL_SERVER_ERROR)
@@ -85,22 +117,25 @@ async def login_user(login_data: UserLogin) -> UserResponse:
             logger.warning(f"Login failed: User not found for email: {login_data.email}")
             raise HTTPException(status_code=401, detail=ErrorMessages.UNAUTHORIZED)
 
-        if not verify_password(login_data.password, user.passwordHash):
+        valid, new_hash = await verify_and_update_password_async(login_data.password, user.passwordHash)
+        if not valid:
             logger.warning(f"Login failed: Invalid password for email: {login_data.email}")
             raise HTTPException(status_code=401, detail=ErrorMessages.UNAUTHORIZED)
 
+        # Stored hash predates the current BCRYPT_ROUNDS policy: replace it while we know the password
+        if new_hash:
+            user.passwordHash = new_hash
+            await user.save(update_fields=["passwordHash"])
+            principal_cache.invalidate(user.id)
+            logger.info(f"Rehashed password for {user.email} to the current bcrypt policy")
+
         # Generate access token
-        access_token = create_access_token({"sub": str(user.id)})
+        access_token = create_access_token(
+            build_access_claims(str(user.id), [ur.role.name for ur in user.user_roles], user.authzEpoch)
+        )
 
         # Generate and store refresh token
-        refresh_token = create_refresh_token({"sub": str(user.id)})
-        await RefreshToken.create(
-            user=user,
-            token=refresh_token,
-            expiresAt=datetime.now(timezone.utc) + timedelta(days=7),
-            revoked=datetime.now(timezone.utc) + timedelta(days=30),
-            status="active"
-        )
+        refresh_token = await _issue_refresh_token(user)
         logger.info(f"User logged in: {user.email}")
 
         # Fetch roles for response
@@ -206,30 +241,38 @@ async def update_user(user_id: str, user_data: UserUpdate) -> UserResponse:
         # Update user fields
         update_dict = user_data.dict(exclude_unset=True, exclude={"roles"})
         if "password" in update_dict:
-            update_dict["passwordHash"] = get_password_hash(update_dict.pop("password"))
+            update_dict["passwordHash"] = await get_password_hash_async(update_dict.pop("password"))
         if update_dict:
             await user.update_from_dict(update_dict).save()
+            principal_cache.invalidate(user.id)
             logger.info(f"Updated user fields for {user.email}: {update_dict.keys()}")
 
         # Add new roles if provided
         if user_data.roles:
-            for role_name in set(user_data.roles):  # Avoid duplicates
-                role = await Role.get_or_none(name=role_name)
-                if not role:
-                    logger.warning(f"Role not found: {role_name}")
-                    raise HTTPException(status_code=400, detail=ErrorMessages.NOT_FOUND)
-                # Check if user already has this role
-                existing = await UserRole.filter(user_id=user.id, role_id=role.id).exists()
-                if not existing:
-                    await UserRole.create(
-                        user=user,
-                        role=role,
-                        description=f"Assigned role {role_name}",
-                        status="active"
-                    )
-                    logger.info(f"Assigned role '{role_name}' to user: {user.email}")
-                else:
-                    logger.debug(f"User {user.email} already has role: {role_name}")
+            roles_assigned = False
+            try:
+                for role_name in set(user_data.roles):  # Avoid duplicates
+                    role = await Role.get_or_none(name=role_name)
+                    if not role:
+                        logger.warning(f"Role not found: {role_name}")
+                        raise HTTPException(status_code=400, detail=ErrorMessages.NOT_FOUND)
+                    # Check if user already has this role
+                    existing = await UserRole.filter(user_id=user.id, role_id=role.id).exists()
+                    if not existing:
+                        await UserRole.create(
+                            user=user,
+                            role=role,
+                            description=f"Assigned role {role_name}",
+                            status="active"
+                        )
+                        roles_assigned = True
+                        logger.info(f"Assigned role '{role_name}' to user: {user.email}")
+                    else:
+                        logger.debug(f"User {user.email} already has role: {role_name}")
+            finally:
+                # Role claims already issued to this user are now stale
+                if roles_assigned:
+                    await bump_authz_epoch([user.id])
 
         # Fetch updated roles for response
         user_roles = await user.user_roles.all().prefetch_related("role")
@@ -264,51 +307,43 @@ async def update_user(user_id: str, user_data: UserUpdate) -> UserResponse:
 
 async def refresh_token(refresh_data: RefreshRequest) -> UserResponse:
     try:
-        # Decode refresh token
+        # Decode refresh token (single-use, so not worth a decode cache slot)
         payload = decode_token(refresh_data.refresh_token)
         user_id = payload.get("sub")
         if not user_id:
             logger.warning("Invalid refresh token: missing user_id")
             raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
 
-        # Verify refresh token exists and is valid
-        refresh_token = await RefreshToken.get_or_none(
-            token=refresh_data.refresh_token,
-            user_id=user_id,
-            status="active",
-            expiresAt__gte=datetime.now(timezone.utc)
-        )
-        if not refresh_token:
-            logger.warning(f"Refresh token not found or expired for user_id: {user_id}")
-            raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
-
-        # Fetch user
-        user = await User.get_or_none(id=user_id).prefetch_related("user_roles__role")
-        if not user:
-            logger.warning(f"User not found for id: {user_id}")
-            raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+        # Rotate in one transaction. Revocation is a single conditional UPDATE, so of two
+        # concurrent refreshes of the same token exactly one matches the active row.
+        now = datetime.now(timezone.utc)
+        async with in_transaction(WRITE_CONNECTION) as connection:
+            revoked = await RefreshToken.filter(
+                token_hash=hash_refresh_token(refresh_data.refresh_token),
+                user_id=user_id,
+                status="active",
+                expiresAt__gte=now
+            ).using_db(connection).update(status="revoked", revoked=now)
+            if not revoked:
+                logger.warning(f"Refresh token not found, expired or already used for user_id: {user_id}")
+                raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+
+            # Fetch user and roles (one roles load, shared by the access token and the response)
+            user = await User.get_or_none(id=user_id).using_db(connection)
+            if not user:
+                logger.warning(f"User not found for id: {user_id}")
+                raise HTTPException(status_code=401, detail=ErrorMessages.INVALID_TOKEN)
+            user_roles = await UserRole.filter(user_id=user.id).using_db(connection).select_related("role")
+
+            # Generate new refresh token; the old one is already revoked, so it does not count against the session cap
+            new_refresh_token = await _issue_refresh_token(user, connection)
 
         # Generate new access token
-        new_access_token = create_access_token({"sub": str(user.id)})
-
-        # Generate new refresh token
-        new_refresh_token = create_refresh_token({"sub": str(user.id)})
-        await RefreshToken.create(
-            user=user,
-            token=new_refresh_token,
-            expiresAt=datetime.now(timezone.utc) + timedelta(days=7),
-            revoked=datetime.now(timezone.utc) + timedelta(days=30),
-            status="active"
+        new_access_token = create_access_token(
+            build_access_claims(str(user.id), [ur.role.name for ur in user_roles], user.authzEpoch)
         )
-
-        # Revoke old refresh token
-        refresh_token.status = "revoked"
-        refresh_token.revoked = datetime.now(timezone.utc)
-        await refresh_token.save()
         logger.info(f"Refreshed tokens for user: {user.email}")
 
-        # Fetch roles for response
-        user_roles = await user.user_roles.all().prefetch_related("role")
         roles = [
             RoleResponse(
                 id=ur.role.id,
@@ -337,7 +372,7 @@ async def refresh_token(refresh_data: RefreshRequest) -> UserResponse:
 
 async def revoke_token(refresh_token: str) -> None:
     try:
-        token = await RefreshToken.get_or_none(token=refresh_token, status="active")
+        token = await RefreshToken.get_or_none(token_hash=hash_refresh_token(refresh_token), status="active")
         if not token:
             logger.warning("Refresh token not found or already revoked")
             raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_TOKEN)
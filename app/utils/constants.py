@@ -4,11 +4,13 @@ class ErrorMessages:
     NOT_FOUND = "Resource not found."
     CONFLICT = "Resource already exists."
     INTERNAL_SERVER_ERROR = "An unexpected error occurred."
+    SERVICE_UNAVAILABLE = "Service temporarily unavailable, please retry."
     UNAUTHORIZED = "Unauthorized access."
     FORBIDDEN = "Access forbidden."
     INVALID_TOKEN = "Invalid or expired token."
     INVALID_PAGE = "Page number must be a positive integer."
     INVALID_LIMIT = "Limit must be a positive integer not exceeding 100."
+    INVALID_CURSOR = "Invalid pagination cursor."
     NO_CLASSES_FOUND = "No classes found for the given criteria."
     INVALID_TIMEZONE = "Invalid or unsupported timezone."
     INVALID_SCHEDULE = "Schedule must be in the future and in IST timezone."
@@ -1,11 +1,27 @@
 import jwt
 from datetime import datetime, timedelta, timezone
+from typing import Iterable
 from app.config.settings import settings
 from app.utils.constants import ErrorMessages
+from app.utils.ttl_cache import TTLCache
+import hashlib
 import logging
+import time
+import uuid
 
 logger = logging.getLogger("devanchor.utils.jwt")
 
+# Verified payloads keyed by token digest; each entry expires no later than the token's `exp`
+decode_cache = TTLCache(max_size=settings.JWT_DECODE_CACHE_MAX_SIZE)
+
+def build_access_claims(user_id: str, roles: Iterable[str] = (), authz_epoch: int = 0) -> dict:
+    """Claims for an access token; role names and the authz epoch are only embedded when JWT_ROLE_CLAIMS is on."""
+    claims = {"sub": user_id}
+    if settings.JWT_ROLE_CLAIMS:
+        claims["roles"] = list(roles)
+        claims["epoch"] = authz_epoch
+    return claims
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -21,7 +37,8 @@ def create_access_token(data: dict) -> str:
 def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
+    # jti keeps tokens minted for one user within the same second distinct
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     try:
         encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
         logger.debug("Refresh token created")
@@ -30,6 +47,10 @@ def create_refresh_token(data: dict) -> str:
         logger.error(f"Failed to create refresh token: {str(e)}", exc_info=True)
         raise
 
+def hash_refresh_token(token: str) -> str:
+    """Hex SHA-256 digest under which a refresh token is stored and looked up."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def decode_token(token: str) -> dict:
     if not token or len(token.split(".")) != 3:
         logger.error("Invalid JWT token format: incorrect number of segments")
@@ -43,4 +64,25 @@ def decode_token(token: str) -> dict:
         raise jwt.InvalidTokenError(ErrorMessages.UNAUTHORIZED)
     except jwt.InvalidTokenError as e:
         logger.error(f"Invalid token: {str(e)}")
-        raise jwt.InvalidTokenError(ErrorMessages.UNAUTHORIZED)
\ No newline at end of file
+        raise jwt.InvalidTokenError(ErrorMessages.UNAUTHORIZED)
+
+def decode_token_cached(token: str) -> dict:
+    """
+    Same contract as `decode_token`, but reuses the verified payload for repeat tokens.
+    The returned dict is shared between callers and must be treated as read-only.
+    """
+    if not settings.JWT_DECODE_CACHE_ENABLED:
+        return decode_token(token)
+
+    key = hashlib.sha256(token.encode()).digest()
+    payload = decode_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = decode_token(token)
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            decode_cache.set(key, payload, ttl_seconds=remaining)
+    return payload
\ No newline at end of file
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Tuple
+import base64
+import binascii
+import json
+
+# Cursor directions: "n" pages forward (rows after the key), "p" backward (rows before it)
+NEXT = "n"
+PREV = "p"
+
+def encode_cursor(direction: str, schedule: datetime, row_id: str) -> str:
+    """Opaque, URL-safe token for a (schedule, id) keyset position."""
+    payload = json.dumps([direction, schedule.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, datetime, str]:
+    """Inverse of encode_cursor. Raises ValueError for anything that is not a valid cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, schedule, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        parsed = datetime.fromisoformat(schedule)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Malformed cursor: {cursor!r}") from e
+    if direction not in (NEXT, PREV) or not isinstance(row_id, str) or parsed.tzinfo is None:
+        raise ValueError(f"Malformed cursor: {cursor!r}")
+    return direction, parsed, row_id
@@ -0,0 +1,62 @@
+"""
+Calibrate the bcrypt work factor (BCRYPT_ROUNDS) for this host.
+
+Times bcrypt hashing at increasing costs and recommends the highest cost whose median
+hash time stays within the target latency. Each extra round doubles the time, so the
+choice directly sets how many logins per second one core can verify.
+
+    python -m app.utils.password_calibration --target-ms 250
+"""
+from passlib.hash import bcrypt
+from app.config.settings import settings
+import argparse
+import statistics
+import time
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+def measure_rounds(rounds: int, samples: int) -> float:
+    """Median seconds to hash one password at `rounds`."""
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def calibrate(target_ms: float, samples: int) -> tuple:
+    """Return (recommended rounds, {rounds: median seconds}) for the target latency."""
+    timings = {}
+    recommended = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        timings[rounds] = measure_rounds(rounds, samples)
+        if timings[rounds] * 1000 > target_ms:
+            break
+        recommended = rounds
+    return recommended, timings
+
+def main(target_ms: float, samples: int):
+    recommended, timings = calibrate(target_ms, samples)
+    print(f"{'rounds':>6}{'median ms':>12}{'logins/s/core':>16}")
+    for rounds, seconds in timings.items():
+        marker = "  <- recommended" if rounds == recommended else ""
+        marker += "  (current)" if rounds == settings.BCRYPT_ROUNDS else ""
+        print(f"{rounds:>6}{seconds * 1000:>12.1f}{1 / seconds:>16.1f}{marker}")
+
+    if timings[recommended] * 1000 > target_ms:
+        print(f"\nEven {MIN_ROUNDS} rounds exceed {target_ms:.0f} ms on this host.")
+    print(f"\nBCRYPT_ROUNDS={recommended}")
+    if recommended != settings.BCRYPT_ROUNDS:
+        print(
+            f"Stored hashes at {settings.BCRYPT_ROUNDS} rounds are rehashed to {recommended} "
+            "on each user's next successful login."
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250, help="Maximum acceptable hash time per login")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes timed per cost")
+    args = parser.parse_args()
+    main(args.target_ms, args.samples)
@@ -1,9 +1,129 @@
 from passlib.context import CryptContext
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from fastapi import HTTPException
+from app.config.settings import settings
+from app.utils.constants import ErrorMessages
+from typing import Optional, Tuple
+import asyncio
+import logging
+import time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max to the configured cost makes needs_update() flag any stored hash with a
+# different cost, in either direction, so logins migrate hashes to the current policy.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+logger = logging.getLogger("devanchor.utils.password")
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify, and if the stored hash no longer matches the policy return a fresh hash to store."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _timed_call(func, *args):
+    # Runs in the worker. CLOCK_MONOTONIC is system-wide, so the start time is comparable
+    # with the submitting process even when the worker is a separate process.
+    return time.monotonic(), func(*args)
+
+class PasswordHasherPool:
+    """
+    Runs bcrypt on a bounded thread or process pool so hashing never blocks the event loop.
+
+    At most `max_workers` calls run at once and at most `max_queue` more wait for a worker;
+    beyond that callers get 503 immediately instead of piling up behind a login burst.
+    """
+
+    def __init__(self, kind: str, max_workers: int, max_queue: int, latency_samples: int = 1024):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_ms = deque(maxlen=latency_samples)
+        self._total_ms = deque(maxlen=latency_samples)
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing the module never forks worker processes
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, func, *args):
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            logger.warning(f"Password hashing pool saturated ({self._in_flight} in flight)")
+            raise HTTPException(status_code=503, detail=ErrorMessages.SERVICE_UNAVAILABLE)
+
+        self._in_flight += 1
+        submitted = time.monotonic()
+        try:
+            started, result = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _timed_call, func, *args
+            )
+        finally:
+            self._in_flight -= 1
+        finished = time.monotonic()
+        self.completed += 1
+        self._wait_ms.append((started - submitted) * 1000)
+        self._total_ms.append((finished - submitted) * 1000)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _summary(samples) -> dict:
+        if not samples:
+            return {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(samples)
+        return {
+            "avg_ms": round(sum(ordered) / len(ordered), 2),
+            "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 2),
+            "max_ms": round(ordered[-1], 2),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait": self._summary(self._wait_ms),
+            "total_latency": self._summary(self._total_ms),
+        }
+
+password_hasher = PasswordHasherPool(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+async def get_password_hash_async(password: str) -> str:
+    """`get_password_hash` on the password hasher pool; raises 503 when it is saturated."""
+    return await password_hasher.run(get_password_hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """`verify_and_update_password` on the password hasher pool; raises 503 when it is saturated."""
+    return await password_hasher.run(verify_and_update_password, plain_password, hashed_password)
@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+import time
+
+class StartupProfile:
+    """
+    Wall time of each startup phase of this process, in milliseconds and in the order the
+    phases ran. Created as the first thing app.main imports, so `created` marks the start
+    of the application's own imports.
+    """
+
+    def __init__(self):
+        self.created = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.role: Optional[str] = None
+        self.total_ms: Optional[float] = None
+        self.completed_at: Optional[datetime] = None
+
+    def record(self, name: str, since: float) -> None:
+        """Record phase `name` as lasting from the perf_counter value `since` until now."""
+        elapsed_ms = (time.perf_counter() - since) * 1000
+        self.phases[name] = round(self.phases.get(name, 0.0) + elapsed_ms, 2)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, since=start)
+
+    def finish(self, role: str) -> None:
+        self.role = role
+        self.total_ms = round((time.perf_counter() - self.created) * 1000, 2)
+        self.completed_at = datetime.now(timezone.utc)
+
+    def summary(self) -> str:
+        phases = " ".join(f"{name}={elapsed_ms:.1f}ms" for name, elapsed_ms in self.phases.items())
+        total = f"{self.total_ms:.1f}ms" if self.total_ms is not None else "pending"
+        return f"{phases} total={total} role={self.role}"
+
+    def stats(self) -> dict:
+        return {
+            "role": self.role,
+            "phases_ms": dict(self.phases),
+            "total_ms": self.total_ms,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+        }
+
+startup_profile = StartupProfile()
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+import pendulum
+
+UTC = dt_timezone.utc
+
+# Formatted (date, time) pairs per (zone, instant). Class schedules are few and listed over
+# and over, so almost every row after the first request is a dict hit instead of building
+# two datetime objects and two strings.
+_FORMAT_CACHE_MAX_SIZE = 65536
+_format_cache: Dict[Tuple[str, datetime], Tuple[str, str]] = {}
+
+@lru_cache(maxsize=512)
+def resolve_timezone(name: str) -> pendulum.Timezone:
+    """
+    Memoized `pendulum.timezone(name)`.
+
+    Raises pendulum.exceptions.InvalidTimezone for unknown names; failures are not cached.
+    """
+    return pendulum.timezone(name)
+
+def format_schedules(schedules: Iterable[datetime], zone: pendulum.Timezone) -> List[Tuple[str, str]]:
+    """
+    Convert aware schedules to (date, time) ISO strings in `zone` in one pass.
+
+    Equivalent to `(s.astimezone(zone).date().isoformat(), s.astimezone(zone).time().isoformat())`
+    per row, with each zone/instant pair converted once and then served from a bounded cache.
+    """
+    zone_key = zone.key
+    cache = _format_cache
+    formatted = []
+    append = formatted.append
+    for schedule in schedules:
+        # Aware datetimes hash by instant, so UTC and zoned values of one instant share an entry
+        key = (zone_key, schedule)
+        pair = cache.get(key)
+        if pair is None:
+            local = schedule.astimezone(zone)
+            pair = (local.date().isoformat(), local.time().isoformat())
+            if len(cache) >= _FORMAT_CACHE_MAX_SIZE:
+                cache.clear()
+            cache[key] = pair
+        append(pair)
+    return formatted
+
+def format_schedule(schedule: datetime, zone: pendulum.Timezone) -> Tuple[str, str]:
+    """Single-row form of `format_schedules`."""
+    return format_schedules((schedule,), zone)[0]
@@ -0,0 +1,109 @@
+"""
+Cost of the authorization step: path matching plus the role check.
+
+Compares the previous approach (UUID regex normalization, exact dict lookup, role list
+scan) against the compiled PermissionMatcher over a realistic mix of request paths and
+role sets.
+
+    python -m benchmarks.authorization --iterations 200000
+"""
+from app.auth.permissions import PERMISSIONS, PermissionMatcher, permission_matcher
+import argparse
+import random
+import re
+import time
+import uuid
+
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+def legacy_is_allowed(path: str, method: str, user_roles) -> bool:
+    """The regex-based check that PermissionMatcher replaced (normalization ran twice per request)."""
+    for _ in range(2):
+        normalized = UUID_PATTERN.sub("{user_id}", path)
+        normalized = normalized.replace("{user_id}", "{role_id}", 1) if "/roles/" in path else normalized
+    allowed_roles = PERMISSIONS.get(normalized, {}).get(method)
+    if not allowed_roles:
+        return False
+    return "*" in allowed_roles or any(role in allowed_roles for role in user_roles)
+
+def compiled_is_allowed(path: str, method: str, user_roles) -> bool:
+    methods = permission_matcher.match(path)
+    allowed_mask = methods.get(method) if methods else 0
+    return bool(allowed_mask and allowed_mask & permission_matcher.registry.mask(user_roles))
+
+def build_workload(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    requests = [
+        ("/api/v1/classes", "GET"),
+        ("/api/v1/classes", "POST"),
+        ("/api/v1/book", "POST"),
+        ("/api/v1/bookings", "GET"),
+        ("/api/v1/users/me", "GET"),
+        ("/api/v1/users", "GET"),
+        ("/api/v1/auth/revoke", "POST"),
+        ("/api/v1/metrics", "GET"),
+    ]
+    id_requests = [
+        ("/api/v1/users/{}", "GET"),
+        ("/api/v1/users/{}-x", "GET"),
+        ("/api/v1/users/{}", "PATCH"),
+        ("/api/v1/users/{}", "DELETE"),
+        ("/api/v1/roles/{}", "PATCH"),
+    ]
+    role_sets = [("client",), ("client",), ("client",), ("instructor", "client"), ("admin",), ("admin", "client")]
+    workload = []
+    for _ in range(size):
+        if rng.random() < 0.3:
+            template, method = rng.choice(id_requests)
+            path = template.format(uuid.UUID(int=rng.getrandbits(128)))
+        else:
+            path, method = rng.choice(requests)
+        workload.append((path, method, rng.choice(role_sets)))
+    return workload
+
+def check_matching_rules():
+    """Literal segments win over parameters, parameters only match UUIDs, and a dead-end literal backtracks."""
+    user_id = str(uuid.uuid4())
+    me = permission_matcher.match("/api/v1/users/me")
+    assert me is not None and "DELETE" not in me, "/users/me must not match /users/{user_id}"
+    assert "DELETE" in permission_matcher.match(f"/api/v1/users/{user_id}")
+    for path in ("/api/v1/users/anything", "/api/v1/users/" + user_id.upper(), f"/api/v1/users/{user_id}/x"):
+        assert permission_matcher.match(path) is None, f"{path} matched a parameter route"
+    assert not compiled_is_allowed("/api/v1/users/anything", "GET", ("client",))
+
+    # /items/<id>/history only exists as a parameter route, so the walk that first follows
+    # the literal <id> segment into a dead end has to backtrack into {item_id}
+    literal_id = str(uuid.uuid4())
+    matcher = PermissionMatcher({
+        f"/items/{literal_id}/pin": {"POST": ["admin"]},
+        "/items/{item_id}/history": {"GET": ["*"]},
+    })
+    assert matcher.match(f"/items/{literal_id}/pin") == {"POST": matcher.registry.bit("admin")}
+    assert matcher.match(f"/items/{literal_id}/history") == {"GET": matcher.registry.bit("*")}
+    assert matcher.match(f"/items/{user_id}/pin") is None
+    assert matcher.match("/items/latest/history") is None
+
+def measure(check, workload: list, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        path, method, roles = workload[i % len(workload)]
+        check(path, method, roles)
+    return (time.perf_counter() - start) / iterations
+
+def main(iterations: int):
+    check_matching_rules()
+    workload = build_workload(1000)
+    mismatches = [item for item in workload if legacy_is_allowed(*item) != compiled_is_allowed(*item)]
+    assert not mismatches, f"decisions differ: {mismatches[:3]}"
+
+    print(f"{'matcher':<10}{'ns/check':>12}{'checks/s':>14}")
+    for name, check in (("legacy", legacy_is_allowed), ("compiled", compiled_is_allowed)):
+        measure(check, workload, 10000)  # warm-up
+        per_check = min(measure(check, workload, iterations) for _ in range(3))
+        print(f"{name:<10}{per_check * 1e9:>12.0f}{1 / per_check:>14.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,69 @@
+"""
+Cross-worker revocation of role claims (authz epochs).
+
+Seeds an in-memory database with an admin, then plays two workers: worker A (the
+process-wide registry) bumps the user's authz epoch, as removing the admin role does,
+while worker B has its own registry and principal cache warmed up before the change.
+Asserts that B rejects the stale claims and reloads its cached principal once its
+epoch TTL has elapsed, and reports how many epoch reads B needed over a request burst.
+
+    python -m benchmarks.authz_revocation --ttl 0.2 --requests 10000
+"""
+from tortoise import Tortoise
+from app.auth.authz_epochs import AuthzEpochRegistry, authz_epochs, bump_authz_epoch
+from app.auth.principal_cache import PrincipalCache
+from app.database.models.roles import Role
+from app.database.models.user_roles import UserRole
+from app.database.models.users import User
+import argparse
+import asyncio
+import time
+
+async def seed() -> User:
+    user = await User.create(email="admin@bench.example.com", username="admin", passwordHash="x")
+    role = await Role.create(name="admin", description="Admin")
+    await UserRole.create(user=user, role=role, description="Admin assignment")
+    return user
+
+async def main(ttl: float, requests: int):
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.database.models"]})
+    try:
+        await Tortoise.generate_schemas()
+        user = await seed()
+        user_id = str(user.id)
+        token_epoch = user.authzEpoch  # Epoch embedded in the admin's access token
+
+        worker_b = AuthzEpochRegistry(max_size=1000, ttl_seconds=ttl)
+        worker_b_principals = PrincipalCache(max_size=1000, ttl_seconds=60)
+        start = time.perf_counter()
+        for _ in range(requests):
+            assert token_epoch >= await worker_b.current_epoch(user_id)
+        elapsed = time.perf_counter() - start
+        print(f"{requests} checks of current claims: {worker_b.reads} epoch read(s), {elapsed / requests * 1e6:.2f} us each")
+        _, roles = await worker_b_principals.get_principal(user_id)
+        assert roles == ("admin",)
+
+        # Worker A revokes the admin role and bumps the epoch
+        await UserRole.filter(user_id=user_id).delete()
+        await bump_authz_epoch([user_id])
+        assert token_epoch < await authz_epochs.current_epoch(user_id), "the bumping worker must reject stale claims at once"
+
+        await asyncio.sleep(ttl)
+        assert token_epoch < await worker_b.current_epoch(user_id), "another worker kept honoring revoked role claims"
+        _, roles = await worker_b_principals.get_principal(user_id, min_epoch=await worker_b.current_epoch(user_id))
+        assert roles == (), f"another worker kept a cached principal with revoked roles: {roles}"
+        print(f"epoch bump seen by a second registry within {ttl:.2f}s; stale claims rejected, cached principal reloaded")
+
+        await User.filter(id=user_id).delete()
+        await asyncio.sleep(ttl)
+        assert await worker_b.current_epoch(user_id) is None, "claims of a deleted user must be rejected"
+        print("claims of a deleted user rejected")
+    finally:
+        await Tortoise.close_connections()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ttl", type=float, default=0.2, help="Epoch TTL of the second worker's registry")
+    parser.add_argument("--requests", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(main(args.ttl, args.requests))
@@ -0,0 +1,103 @@
+"""
+Booking throughput during a burst, with and without group commit.
+
+Fires concurrent create_booking calls at a few popular classes on a WAL database file:
+most succeed, some hit a full class (400) and some are duplicates (409). Each mode must
+hand every caller the same outcome; bookings/s is reported for synchronous=NORMAL and
+FULL, since group commit saves one commit (and with FULL one fsync) per booking.
+
+    python -m benchmarks.booking_group_commit --bookings 1000 --dir .
+"""
+from collections import Counter
+from fastapi import HTTPException
+from tortoise import Tortoise
+from app.database.connection import get_sqlite_pragmas
+from app.database.models.classes import Class
+from app.database.models.users import User
+from app.schemas.bookings import BookingCreate
+from app.services import bookings as booking_service
+from app.services.catalog_cache import catalog_cache
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+
+CLASSES = 4
+
+async def seed(clients: int, slots: int) -> tuple:
+    instructor = await User.create(email="instructor@bench.example.com", username="instructor", passwordHash="x")
+    await User.bulk_create([
+        User(email=f"client{i}@bench.example.com", username=f"client{i}", passwordHash="x") for i in range(clients)
+    ])
+    start = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    await Class.bulk_create([
+        Class(name=f"Class {i}", instructor=instructor, schedule=start + datetime.timedelta(hours=i), slots=slots)
+        for i in range(CLASSES)
+    ])
+    users = await User.exclude(id=instructor.id).order_by("username")
+    class_ids = await Class.all().order_by("schedule").values_list("id", flat=True)
+    return users, class_ids
+
+async def book(user: User, class_id: str) -> int:
+    try:
+        await booking_service.create_booking(
+            BookingCreate(class_id=class_id, client_name=user.username, client_email=user.email), user
+        )
+        return 201
+    except HTTPException as e:
+        return e.status_code
+
+async def run(bookings: int, synchronous: str, group_commit: bool, directory: str) -> tuple:
+    booking_service.booking_writer.enabled = group_commit
+    with tempfile.TemporaryDirectory(dir=directory) as directory:
+        await Tortoise.init(config={
+            "connections": {
+                "default": {
+                    "engine": "tortoise.backends.sqlite",
+                    "credentials": {
+                        "file_path": os.path.join(directory, "bench.db"),
+                        **get_sqlite_pragmas(),
+                        "synchronous": synchronous,
+                    },
+                }
+            },
+            "apps": {"models": {"models": ["app.database.models"], "default_connection": "default"}},
+        })
+        try:
+            await Tortoise.generate_schemas()
+            # Every 10th request repeats the previous one (duplicate); classes fill up at 90%
+            users, class_ids = await seed(clients=bookings, slots=int(bookings * 0.9 / CLASSES))
+            requests = []
+            for i in range(bookings):
+                if i % 10 == 9:
+                    requests.append(requests[-1])
+                else:
+                    requests.append((users[i], class_ids[i % CLASSES]))
+
+            start = time.perf_counter()
+            statuses = await asyncio.gather(*(book(user, class_id) for user, class_id in requests))
+            elapsed = time.perf_counter() - start
+        finally:
+            await Tortoise.close_connections()
+    return Counter(statuses), bookings / elapsed
+
+async def main(bookings: int, directory: str):
+    catalog_cache.enabled = False
+    print(f"{'synchronous':<13}{'group commit':>14}{'bookings/s':>12}  outcomes")
+    for synchronous in ("NORMAL", "FULL"):
+        baseline = None
+        for group_commit in (False, True):
+            outcomes, rate = await run(bookings, synchronous, group_commit, directory)
+            baseline = baseline or outcomes
+            assert outcomes == baseline, f"group commit changed outcomes: {outcomes} != {baseline}"
+            print(f"{synchronous:<13}{'on' if group_commit else 'off':>14}{rate:>12.1f}  {dict(sorted(outcomes.items()))}")
+    print(f"batches: {booking_service.booking_writer.stats()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--dir", default=None, help="Where to create the database; use a real disk, not tmpfs, to see fsync cost")
+    args = parser.parse_args()
+    asyncio.run(main(args.bookings, args.dir))
@@ -0,0 +1,129 @@
+"""
+Query count of the class listing (get_all_classes) as the page size grows.
+
+Seeds an in-memory database with classes and bookings, backfills `booked_count` the way
+the migration does, serves pages of increasing size and asserts every page costs the same
+constant number of queries, then reports latency. Finally books through create_booking and
+asserts the listing's availability still agrees with the active bookings counted from the
+bookings table, i.e. the counter and the bookings have not drifted apart.
+
+    python -m benchmarks.classes_query_count --classes 500 --bookings-per-class 5
+"""
+from tortoise import Tortoise
+from app.database.models.bookings import Booking
+from app.database.models.classes import Class
+from app.database.models.users import User
+from app.schemas.bookings import BookingCreate
+from app.services.bookings import create_booking
+from app.services.catalog_cache import catalog_cache
+from app.services.classes import get_all_classes
+import argparse
+import asyncio
+import datetime
+import logging
+import time
+
+EXPECTED_QUERIES = 2  # total count + one page query (page mode)
+
+class QueryCounter(logging.Handler):
+    """Counts the per-query DEBUG records emitted by Tortoise's database client."""
+
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+async def seed(classes: int, bookings_per_class: int) -> None:
+    instructor = await User.create(email="instructor@bench", username="instructor", passwordHash="x")
+    clients = [
+        User(email=f"client{i}@bench", username=f"client{i}", passwordHash="x") for i in range(bookings_per_class)
+    ]
+    await User.bulk_create(clients)
+    start = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    class_rows = [
+        Class(
+            name=f"Class {i}",
+            instructor=instructor,
+            schedule=start + datetime.timedelta(minutes=i),
+            slots=bookings_per_class + 5,
+        )
+        for i in range(classes)
+    ]
+    await Class.bulk_create(class_rows)
+    await Booking.bulk_create([
+        Booking(user_id=client.id, class__id=class_row.id, status="active" if n % 4 else "cancelled")
+        for class_row in class_rows
+        for n, client in enumerate(clients)
+    ])
+    # bulk_create bypasses create_booking; backfill the counter as migration 2 does
+    await Tortoise.get_connection("default").execute_script(
+        'UPDATE "classes" SET "booked_count" = (SELECT COUNT(*) FROM "bookings" '
+        'WHERE "bookings"."class__id" = "classes"."id" AND "bookings"."status" = \'active\')'
+    )
+
+async def check_counts_agree(limit: int) -> None:
+    """Listing availability must equal slots minus the active bookings in the bookings table."""
+    page = await get_all_classes(page=1, limit=limit)
+    for item in page.items:
+        class_row = await Class.get(id=item.id)
+        active = await Booking.filter(class__id=item.id, status="active").count()
+        assert item.available_slots == class_row.slots - active, (
+            f"class {item.id}: listing says {item.available_slots} available, bookings say {class_row.slots - active}"
+        )
+
+async def main(classes: int, bookings_per_class: int):
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.database.models"]})
+    try:
+        await Tortoise.generate_schemas()
+        await seed(classes, bookings_per_class)
+        await report(classes, bookings_per_class)
+    finally:
+        await Tortoise.close_connections()
+
+async def report(classes: int, bookings_per_class: int):
+    catalog_cache.enabled = False  # Measure the queries themselves, not the response cache
+    counter = QueryCounter()
+    db_logger = logging.getLogger("tortoise.db_client")
+    db_logger.addHandler(counter)
+    db_logger.setLevel(logging.DEBUG)
+    db_logger.propagate = False
+
+    # Every fourth booking is cancelled and must not count against the slots
+    expected_available = 5 + len(range(0, bookings_per_class, 4))
+    print(f"{'page size':>10}{'queries':>10}{'ms':>10}")
+    for limit in (1, 10, 50, 100):
+        counter.count = 0
+        start = time.perf_counter()
+        page = await get_all_classes(page=1, limit=limit)
+        elapsed = time.perf_counter() - start
+        assert len(page.items) == min(limit, classes)
+        assert all(item.available_slots == expected_available for item in page.items)
+        assert counter.count == EXPECTED_QUERIES, f"page of {limit} took {counter.count} queries"
+        print(f"{limit:>10}{counter.count:>10}{elapsed * 1000:>10.2f}")
+
+    # Keyset pages skip the total count: one query each, however deep the page
+    cursor, depth = page.next_cursor, 1
+    while cursor:
+        counter.count = 0
+        page = await get_all_classes(limit=100, cursor=cursor)
+        assert counter.count == 1, f"cursor page {depth} took {counter.count} queries"
+        cursor, depth = page.next_cursor, depth + 1
+    print(f"walked {depth} pages of 100 by cursor at 1 query each")
+
+    # Book the first classes through the service and compare against the bookings table
+    db_logger.removeHandler(counter)
+    page = await get_all_classes(page=1, limit=10)
+    booker = await User.create(email="booker@bench.example.com", username="booker", passwordHash="x")
+    for item in page.items:
+        await create_booking(BookingCreate(class_id=item.id, client_name="booker", client_email=booker.email), booker)
+    await check_counts_agree(limit=100)
+    print("availability from booked_count agrees with active bookings after create_booking")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--classes", type=int, default=500)
+    parser.add_argument("--bookings-per-class", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.classes, args.bookings_per_class))
@@ -0,0 +1,92 @@
+"""
+Request-path cost of application logging on GET /api/v1/health.
+
+Drives requests through the middleware pipeline (which logs one "Completed request"
+record per sampled request) with the previous setup (stdlib handlers, written and
+flushed inline on the event loop), the buffered handlers inline, and the buffered
+handlers behind the queue, with the stdlib and the orjson encoder, every request
+logged; then queued with access-log sampling at 10% and 0%. Reports the median time per request as seen by the event loop, and how long
+the listener then needed to write out the backlog. Logs go to a scratch directory and
+console output to /dev/null.
+
+    python -m benchmarks.logging_overhead --requests 5000
+"""
+from app.config.settings import settings
+from app.logging.config import setup_logging, stop_log_queue
+from app.middleware.logger import access_log_sampler
+from benchmarks.middleware_overhead import build_app, run
+from logging.handlers import RotatingFileHandler
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+MODES = (
+    ("stdlib", False, "json", 1.0),
+    ("inline", False, "json", 1.0),
+    ("inline", False, "orjson", 1.0),
+    ("queued", True, "json", 1.0),
+    ("queued", True, "orjson", 1.0),
+    ("queued", True, "orjson", 0.1),
+    ("queued", True, "orjson", 0.0),
+)
+
+def use_stdlib_handlers(logger: logging.Logger) -> None:
+    """Swap the configured handlers for the plain stdlib classes the app used before."""
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.FileHandler):
+            replacement = RotatingFileHandler(handler.baseFilename, maxBytes=handler.maxBytes, backupCount=handler.backupCount)
+        else:
+            replacement = logging.StreamHandler(handler.stream)
+        replacement.setLevel(handler.level)
+        replacement.setFormatter(handler.formatter)
+        logger.removeHandler(handler)
+        handler.close()
+        logger.addHandler(replacement)
+
+async def measure(mode: str, queued: bool, encoder: str, sample_rate: float, requests: int, rounds: int) -> tuple:
+    access_log_sampler.route_rates = {}  # The default config samples /health at 0
+    access_log_sampler.default_rate = sample_rate
+    settings.LOG_QUEUE_ENABLED = queued
+    settings.LOG_JSON_ENCODER = encoder
+    setup_logging()
+    app_logger = logging.getLogger("devanchor")
+    app_logger.setLevel(logging.INFO)
+    if mode == "stdlib":
+        use_stdlib_handlers(app_logger)
+    app = build_app("pipeline")
+    await run(app, 200)  # warm-up
+    best = None
+    for _ in range(rounds):
+        timings = await run(app, requests)
+        if best is None or statistics.median(timings) < statistics.median(best):
+            best = timings
+    start = time.perf_counter()
+    stop_log_queue()  # Waits for the listener to write everything still queued
+    drain_ms = (time.perf_counter() - start) * 1000
+    return best, drain_ms
+
+async def main(requests: int, rounds: int):
+    print(f"{'logging':<10}{'encoder':<9}{'sample':>7}{'median us':>11}{'p95 us':>9}{'req/s':>9}{'drain ms':>10}")
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull:
+        os.chdir(directory)  # setup_logging writes to ./logs
+        for mode, queued, encoder, sample_rate in MODES:
+            with contextlib.redirect_stderr(devnull):  # The console handler binds sys.stderr when created
+                timings, drain_ms = await measure(mode, queued, encoder, sample_rate, requests, rounds)
+            median = statistics.median(timings)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(
+                f"{mode:<10}{encoder:<9}{sample_rate:>7.0%}{median * 1e6:>11.1f}{p95 * 1e6:>9.1f}"
+                f"{len(timings) / sum(timings):>9.0f}{drain_ms:>10.1f}"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.rounds))
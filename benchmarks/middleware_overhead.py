@@ -0,0 +1,86 @@
+"""
+Per-request middleware overhead on GET /api/v1/health.
+
+Compares an app without middleware against the legacy BaseHTTPMiddleware stack and the
+single pure-ASGI pipeline. Requests are driven straight through the ASGI interface so the
+numbers reflect middleware cost rather than HTTP client cost.
+
+    python -m benchmarks.middleware_overhead --requests 5000
+"""
+from fastapi import FastAPI
+from app.middleware.pipeline import add_middleware_stack
+from app.routes.health_api import router as health_router
+import argparse
+import asyncio
+import statistics
+import time
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+    if mode != "none":
+        add_middleware_stack(app, mode=mode)
+    app.include_router(health_router, prefix="/api/v1")
+    return app
+
+def make_scope(i: int) -> dict:
+    # Spread requests over many client IPs so the default 100 req/min budget never trips
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/health",
+        "raw_path": b"/api/v1/health",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"user-agent", b"bench")],
+        "client": (f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}", 40000),
+        "server": ("bench", 80),
+    }
+
+async def run(app: FastAPI, requests: int) -> list:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = []
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        await app(make_scope(i), receive, send)
+        timings.append(time.perf_counter() - start)
+    assert set(status) == {200}, f"unexpected statuses: {set(status)}"
+    return timings
+
+async def main(requests: int, rounds: int):
+    results = {}
+    for mode in ("none", "legacy", "pipeline"):
+        app = build_app(mode)
+        await run(app, 200)  # warm-up
+        best = None
+        for _ in range(rounds):
+            timings = await run(app, requests)
+            if best is None or statistics.median(timings) < statistics.median(best):
+                best = timings
+        results[mode] = best
+
+    baseline = statistics.median(results["none"])
+    print(f"{'mode':<10}{'median us':>12}{'p95 us':>10}{'req/s':>10}{'overhead us':>14}")
+    for mode, timings in results.items():
+        median = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(
+            f"{mode:<10}{median * 1e6:>12.1f}{p95 * 1e6:>10.1f}"
+            f"{len(timings) / sum(timings):>10.0f}{(median - baseline) * 1e6:>14.1f}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.rounds))
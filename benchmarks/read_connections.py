@@ -0,0 +1,95 @@
+"""
+Class listing throughput against the number of read-only connections.
+
+Serves concurrent listing pages from a WAL database file while bookings are written in
+the background, with 0 read connections (everything queues on the single writer
+connection) and then with increasing numbers of query_only readers.
+
+    python -m benchmarks.read_connections --pages 400 --concurrency 16
+"""
+from tortoise import Tortoise
+from app.database import connection as db_connection
+from app.database.connection import get_sqlite_pragmas
+from app.database.models.classes import Class
+from app.database.models.users import User
+from app.schemas.bookings import BookingCreate
+from app.services.bookings import create_booking
+from app.services.catalog_cache import catalog_cache
+from app.services.classes import get_all_classes
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+
+def tortoise_config(file_path: str, readers: tuple) -> dict:
+    def sqlite(**extra) -> dict:
+        return {"engine": "tortoise.backends.sqlite", "credentials": {"file_path": file_path, **get_sqlite_pragmas(), **extra}}
+    return {
+        "connections": {"default": sqlite(), **{name: sqlite(query_only="ON") for name in readers}},
+        "apps": {"models": {"models": ["app.database.models"], "default_connection": "default"}},
+    }
+
+async def seed(classes: int, clients: int) -> list:
+    instructor = await User.create(email="instructor@bench.example.com", username="instructor", passwordHash="x")
+    await User.bulk_create([
+        User(email=f"client{i}@bench.example.com", username=f"client{i}", passwordHash="x") for i in range(clients)
+    ])
+    start = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    await Class.bulk_create([
+        Class(name=f"Class {i}", instructor=instructor, schedule=start + datetime.timedelta(minutes=i), slots=clients)
+        for i in range(classes)
+    ])
+    return await User.exclude(id=instructor.id)
+
+async def writer(users: list, class_ids: list, stop: asyncio.Event) -> int:
+    written = 0
+    for i, user in enumerate(users):
+        if stop.is_set():
+            break
+        await create_booking(
+            BookingCreate(class_id=class_ids[i % len(class_ids)], client_name=user.username, client_email=user.email), user
+        )
+        written += 1
+    return written
+
+async def reader(pages: int, turn) -> None:
+    for _ in range(pages):
+        await get_all_classes(page=1 + next(turn) % 20, limit=50)
+
+async def run(readers: int, pages: int, concurrency: int) -> tuple:
+    names = tuple(f"read_{i}" for i in range(readers))
+    db_connection.READ_CONNECTIONS = names
+    with tempfile.TemporaryDirectory() as directory:
+        await Tortoise.init(config=tortoise_config(os.path.join(directory, "bench.db"), names))
+        try:
+            await Tortoise.generate_schemas()
+            users = await seed(classes=1000, clients=pages * 2)
+            class_ids = await Class.all().values_list("id", flat=True)
+
+            stop = asyncio.Event()
+            writes = asyncio.create_task(writer(users, class_ids, stop))
+            turn = iter(range(10 ** 9))
+            start = time.perf_counter()
+            await asyncio.gather(*(reader(pages // concurrency, turn) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            stop.set()
+            written = await writes
+        finally:
+            await Tortoise.close_connections()
+    return (pages // concurrency) * concurrency / elapsed, written / elapsed
+
+async def main(pages: int, concurrency: int):
+    catalog_cache.enabled = False  # Measure the database, not the response cache
+    print(f"{'readers':>8}{'pages/s':>10}{'bookings/s':>12}")
+    for readers in (0, 1, 2, 4):
+        pages_per_s, bookings_per_s = await run(readers, pages, concurrency)
+        print(f"{readers:>8}{pages_per_s:>10.1f}{bookings_per_s:>12.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.concurrency))
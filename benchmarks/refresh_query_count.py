@@ -0,0 +1,80 @@
+"""
+Query count and race safety of refresh token rotation (refresh_token).
+
+Seeds an in-memory database with a user holding a few roles, then rotates a refresh
+token chain, asserting every rotation costs the same constant number of queries, and
+that of two concurrent refreshes of one token exactly one succeeds.
+
+    python -m benchmarks.refresh_query_count --rotations 200
+"""
+from fastapi import HTTPException
+from tortoise import Tortoise
+from app.database.models.roles import Role
+from app.database.models.refresh_tokens import RefreshToken
+from app.database.models.user_roles import UserRole
+from app.database.models.users import User
+from app.schemas.user import RefreshRequest
+from app.services.user import _issue_refresh_token, refresh_token
+from benchmarks.classes_query_count import QueryCounter
+import argparse
+import asyncio
+import logging
+import time
+
+# Revoking UPDATE, user, user roles with their role rows, new token INSERT, session-cap DELETE
+EXPECTED_QUERIES = 5
+
+async def seed(roles: int) -> User:
+    user = await User.create(email="client@bench.example.com", username="client", passwordHash="x")
+    for i in range(roles):
+        role = await Role.create(name=f"role{i}", description=f"Role {i}")
+        await UserRole.create(user=user, role=role, description=f"Role {i} assignment")
+    return user
+
+async def main(rotations: int, roles: int):
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.database.models"]})
+    try:
+        await Tortoise.generate_schemas()
+        user = await seed(roles)
+        await report(user, rotations, roles)
+    finally:
+        await Tortoise.close_connections()
+
+async def report(user: User, rotations: int, roles: int):
+    counter = QueryCounter()
+    db_logger = logging.getLogger("tortoise.db_client")
+    db_logger.addHandler(counter)
+    db_logger.setLevel(logging.DEBUG)
+    db_logger.propagate = False
+
+    token = await _issue_refresh_token(user)
+    timings = []
+    for rotation in range(rotations):
+        counter.count = 0
+        start = time.perf_counter()
+        response = await refresh_token(RefreshRequest(refresh_token=token))
+        timings.append(time.perf_counter() - start)
+        assert len(response.roles) == roles
+        assert counter.count == EXPECTED_QUERIES, f"rotation {rotation} took {counter.count} queries"
+        token = response.refresh_token
+    timings.sort()
+    print(f"{rotations} rotations at {EXPECTED_QUERIES} queries each; "
+          f"median {timings[len(timings) // 2] * 1000:.2f} ms, max {timings[-1] * 1000:.2f} ms")
+
+    # Two clients race with the same token: one rotation wins, the other is rejected
+    results = await asyncio.gather(
+        refresh_token(RefreshRequest(refresh_token=token)),
+        refresh_token(RefreshRequest(refresh_token=token)),
+        return_exceptions=True,
+    )
+    rejected = [r for r in results if isinstance(r, HTTPException) and r.status_code == 401]
+    assert len(rejected) == 1, f"concurrent refresh results: {results}"
+    assert await RefreshToken.filter(user_id=user.id, status="active").count() == 1
+    print("concurrent refresh of one token: 1 succeeded, 1 rejected")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rotations", type=int, default=200)
+    parser.add_argument("--roles", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rotations, args.roles))
@@ -0,0 +1,114 @@
+"""
+Booking and class listing throughput under different SQLite connection profiles.
+
+Each profile gets a fresh database file, seeded with classes and clients. The benchmark
+then books every client onto a class (one write transaction per booking, so commit and
+fsync cost dominate), serves listing pages (read path: page cache and mmap), and runs
+both at once. "configured" is the profile from the SQLITE_* settings.
+
+    python -m benchmarks.sqlite_profiles --bookings 500 --pages 200
+"""
+from tortoise import Tortoise
+from app.database.connection import get_sqlite_pragmas, read_sqlite_pragmas
+from app.database.models.classes import Class
+from app.database.models.users import User
+from app.schemas.bookings import BookingCreate
+from app.services.bookings import create_booking
+from app.services.catalog_cache import catalog_cache
+from app.services.classes import get_all_classes
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+
+PROFILES = {
+    # What a bare sqlite3 connection gets: rollback journal, fsync on every commit, small cache
+    "sqlite-default": {
+        "journal_mode": "DELETE", "synchronous": "FULL", "mmap_size": 0,
+        "cache_size": -2000, "busy_timeout": 5000, "temp_store": "DEFAULT",
+    },
+    # Tortoise's own defaults: WAL, but still a full fsync per commit
+    "wal-full": {
+        "journal_mode": "WAL", "synchronous": "FULL", "mmap_size": 0,
+        "cache_size": -2000, "busy_timeout": 5000, "temp_store": "DEFAULT",
+    },
+    "configured": get_sqlite_pragmas(),
+}
+
+async def seed(classes: int, clients: int) -> list:
+    instructor = await User.create(email="instructor@bench.example.com", username="instructor", passwordHash="x")
+    await User.bulk_create([
+        User(email=f"client{i}@bench.example.com", username=f"client{i}", passwordHash="x") for i in range(clients)
+    ])
+    start = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    await Class.bulk_create([
+        Class(name=f"Class {i}", instructor=instructor, schedule=start + datetime.timedelta(minutes=i), slots=clients)
+        for i in range(classes)
+    ])
+    return await User.exclude(id=instructor.id).order_by("username")
+
+async def book_all(users: list, class_ids: list) -> None:
+    await asyncio.gather(*(
+        create_booking(
+            BookingCreate(class_id=class_ids[i % len(class_ids)], client_name=user.username, client_email=user.email),
+            user,
+        )
+        for i, user in enumerate(users)
+    ))
+
+async def list_pages(pages: int) -> None:
+    await asyncio.gather(*(get_all_classes(page=1 + i % 10, limit=50) for i in range(pages)))
+
+async def run_profile(name: str, pragmas: dict, bookings: int, pages: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        await Tortoise.init(config={
+            "connections": {
+                "default": {
+                    "engine": "tortoise.backends.sqlite",
+                    "credentials": {"file_path": os.path.join(directory, f"{name}.db"), **pragmas},
+                }
+            },
+            "apps": {"models": {"models": ["app.database.models"], "default_connection": "default"}},
+        })
+        try:
+            await Tortoise.generate_schemas()
+            users = await seed(classes=500, clients=bookings * 2)
+            class_ids = await Class.all().order_by("schedule").values_list("id", flat=True)
+            effective = await read_sqlite_pragmas()
+
+            start = time.perf_counter()
+            await book_all(users[:bookings], class_ids)
+            write_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            await list_pages(pages)
+            read_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            await asyncio.gather(book_all(users[bookings:], class_ids), list_pages(pages))
+            mixed_s = time.perf_counter() - start
+        finally:
+            await Tortoise.close_connections()
+    return {
+        "effective": effective,
+        "bookings/s": bookings / write_s,
+        "pages/s": pages / read_s,
+        "mixed ops/s": (bookings + pages) / mixed_s,
+    }
+
+async def main(bookings: int, pages: int):
+    catalog_cache.enabled = False  # Measure the database, not the response cache
+    print(f"{'profile':<16}{'bookings/s':>12}{'pages/s':>10}{'mixed ops/s':>13}  effective pragmas")
+    for name, pragmas in PROFILES.items():
+        result = await run_profile(name, pragmas, bookings, pages)
+        effective = " ".join(f"{key}={value}" for key, value in result["effective"].items())
+        print(f"{name:<16}{result['bookings/s']:>12.1f}{result['pages/s']:>10.1f}{result['mixed ops/s']:>13.1f}  {effective}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.bookings, args.pages))
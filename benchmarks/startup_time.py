@@ -0,0 +1,78 @@
+"""
+Database startup time (init_db) with and without the fast-start schema check.
+
+Copies the database and migrations into a scratch directory, brings the copy up to date
+with one full Aerich boot, then boots fresh interpreters repeatedly with DB_FAST_START
+off (Aerich init + upgrade + migrate) and on (fingerprint check only). Reports the
+median init_db time and the median whole-process time, imports included, plus the
+startup profile phases of the last boot.
+
+    python -m benchmarks.startup_time --db ./test.db --runs 7
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BOOT = """
+import asyncio, json, time
+from tortoise import Tortoise
+from app.database.connection import init_db
+from app.utils.startup_profile import startup_profile
+
+async def boot():
+    try:
+        return await init_db()
+    finally:
+        await Tortoise.close_connections()
+
+start = time.perf_counter()
+ok, reason = asyncio.run(boot())
+print(json.dumps({"ok": ok, "reason": reason, "init_db_ms": (time.perf_counter() - start) * 1000, "phases": startup_profile.phases}))
+"""
+
+def boot(directory: str, fast_start: bool) -> dict:
+    env = dict(
+        os.environ,
+        DB_ENV="test",
+        DB_FILE_TEST=os.path.join(directory, "bench.db"),
+        DB_FAST_START=str(fast_start).lower(),
+        PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])),
+    )
+    env.setdefault("JWT_SECRET_KEY", "benchmark")
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", BOOT], cwd=directory, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+def main(db: str, runs: int):
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(db, os.path.join(directory, "bench.db"))
+        shutil.copytree("migrations", os.path.join(directory, "migrations"), ignore=shutil.ignore_patterns("__pycache__"))
+        boot(directory, fast_start=False)  # Apply pending migrations so both modes start from a current schema
+
+        print(f"{'mode':<12}{'init_db ms':>12}{'process ms':>12}  result")
+        for fast_start in (False, True):
+            results = [boot(directory, fast_start) for _ in range(runs)]
+            init_ms = statistics.median(r["init_db_ms"] for r in results)
+            process_ms = statistics.median(r["process_ms"] for r in results)
+            print(f"{'fast' if fast_start else 'full':<12}{init_ms:>12.1f}{process_ms:>12.1f}  {results[-1]['reason']}")
+            print(f"{'':<12}phases: {results[-1]['phases']}")
+        leftover = set(os.listdir(os.path.join(directory, "migrations", "models"))) - set(os.listdir("migrations/models"))
+        if leftover:
+            print(f"full boots wrote migration files: {sorted(leftover)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default="./test.db", help="Database to copy (it is not modified)")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+    main(args.db, args.runs)
@@ -0,0 +1,63 @@
+"""
+Converting UTC class schedules to client-local date/time strings.
+
+Compares the per-row conversion the services used to do (zone lookup, then astimezone
+and separate date/time isoformat calls, twice per row as get_user_bookings did) against
+the memoized zone registry and batch formatter in app.utils.timezones, both on a cold
+cache (first request for these schedules) and a warm one (every later request).
+
+    python -m benchmarks.timezone_formatting --rows 10000
+"""
+from app.utils import timezones
+from app.utils.timezones import format_schedules, resolve_timezone
+import argparse
+import datetime
+import pendulum
+import random
+import time
+
+ZONES = ("Asia/Kolkata", "America/New_York", "Europe/London", "Australia/Sydney")
+
+def per_row(schedules: list, zone_name: str) -> list:
+    tz = pendulum.timezone(zone_name)
+    return [
+        (schedule.astimezone(tz).date().isoformat(), schedule.astimezone(tz).time().isoformat())
+        for schedule in schedules
+    ]
+
+def batched(schedules: list, zone_name: str) -> list:
+    return format_schedules(schedules, resolve_timezone(zone_name))
+
+def build_schedules(rows: int, seed: int = 11) -> list:
+    # Classes spread over a year, on the hour or half hour, as the catalog holds them
+    rng = random.Random(seed)
+    start = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    return [start + datetime.timedelta(minutes=30 * rng.randrange(0, 2 * 24 * 365)) for _ in range(rows)]
+
+def measure(convert, schedules: list, zone_name: str, rounds: int, cold: bool = False) -> float:
+    best = None
+    for _ in range(rounds):
+        if cold:
+            timezones._format_cache.clear()
+        start = time.perf_counter()
+        convert(schedules, zone_name)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(rows: int, rounds: int):
+    schedules = build_schedules(rows)
+    print(f"{'zone':<20}{'per-row ms':>12}{'cold ms':>10}{'warm ms':>10}{'warm speedup':>14}")
+    for zone_name in ZONES:
+        assert per_row(schedules, zone_name) == batched(schedules, zone_name), f"output differs for {zone_name}"
+        slow = measure(per_row, schedules, zone_name, rounds)
+        cold = measure(batched, schedules, zone_name, rounds, cold=True)
+        warm = measure(batched, schedules, zone_name, rounds)
+        print(f"{zone_name:<20}{slow * 1000:>12.2f}{cold * 1000:>10.2f}{warm * 1000:>10.2f}{slow / warm:>13.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.rounds)
@@ -0,0 +1,15 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "classes" ADD "booked_count" INT NOT NULL DEFAULT 0;
+        UPDATE "classes" SET "booked_count" = (
+            SELECT COUNT(*) FROM "bookings"
+            WHERE "bookings"."class__id" = "classes"."id" AND "bookings"."status" = 'active'
+        );"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "classes" DROP COLUMN "booked_count";"""
@@ -0,0 +1,60 @@
+from tortoise import BaseDBAsyncClient
+import hashlib
+
+# SQLite cannot drop a UNIQUE column, so the table is rebuilt with the hashed column.
+# Digests are computed here in Python and copied into the new table; the returned
+# script then swaps the tables.
+CREATE_HASHED_TABLE = """
+CREATE TABLE "refresh_tokens_new" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "createdAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "token_hash" VARCHAR(64) NOT NULL UNIQUE,
+    "expiresAt" TIMESTAMP NOT NULL,
+    "revoked" TIMESTAMP NOT NULL,
+    "status" VARCHAR(9) NOT NULL DEFAULT 'active' /* active: active\\ninactive: inactive\\ncancelled: cancelled */,
+    "user_id" VARCHAR(36) NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+)"""
+
+COLUMNS = '"id", "createdAt", "updatedAt", "expiresAt", "revoked", "status", "user_id"'
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    await db.execute_script(CREATE_HASHED_TABLE)
+    _, rows = await db.execute_query(f'SELECT {COLUMNS}, "token" FROM "refresh_tokens"')
+    if rows:
+        await db.execute_many(
+            f'INSERT INTO "refresh_tokens_new" ({COLUMNS}, "token_hash") VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                [*(row[column] for column in ("id", "createdAt", "updatedAt", "expiresAt", "revoked", "status", "user_id")),
+                 hashlib.sha256(row["token"].encode()).hexdigest()]
+                for row in rows
+            ],
+        )
+    return """
+        DROP TABLE "refresh_tokens";
+        ALTER TABLE "refresh_tokens_new" RENAME TO "refresh_tokens";
+        CREATE INDEX "idx_refresh_tok_user_id_9ddaa8" ON "refresh_tokens" ("user_id");
+        CREATE INDEX "idx_refresh_tok_token_h_99a721" ON "refresh_tokens" ("token_hash", "status");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    # Digests cannot be turned back into tokens: keep the rows but revoke them all,
+    # so every session has to log in again.
+    return f"""
+        CREATE TABLE "refresh_tokens_old" (
+            "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+            "createdAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            "updatedAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            "token" VARCHAR(255) NOT NULL UNIQUE,
+            "expiresAt" TIMESTAMP NOT NULL,
+            "revoked" TIMESTAMP NOT NULL,
+            "status" VARCHAR(9) NOT NULL DEFAULT 'active' /* active: active\\ninactive: inactive\\ncancelled: cancelled */,
+            "user_id" VARCHAR(36) NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+        );
+        INSERT INTO "refresh_tokens_old" ({COLUMNS}, "token")
+            SELECT "id", "createdAt", "updatedAt", "expiresAt", "revoked", 'revoked', "user_id", "token_hash"
+            FROM "refresh_tokens";
+        DROP TABLE "refresh_tokens";
+        ALTER TABLE "refresh_tokens_old" RENAME TO "refresh_tokens";
+        CREATE INDEX "idx_refresh_tok_user_id_9ddaa8" ON "refresh_tokens" ("user_id");"""
@@ -0,0 +1,21 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "bookings_archive" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "user_id" VARCHAR(36) NOT NULL,
+    "class_id" VARCHAR(36) NOT NULL,
+    "status" VARCHAR(9) NOT NULL /* active: active\\ninactive: inactive\\ncancelled: cancelled\\nrevoked: revoked */,
+    "createdAt" TIMESTAMP NOT NULL,
+    "updatedAt" TIMESTAMP NOT NULL,
+    "archivedAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+        CREATE INDEX IF NOT EXISTS "idx_bookings_ar_user_id_e81742" ON "bookings_archive" ("user_id");
+        CREATE INDEX IF NOT EXISTS "idx_bookings_ar_class_i_3fd34a" ON "bookings_archive" ("class_id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "bookings_archive";"""
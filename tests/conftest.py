@@ -0,0 +1,40 @@
+"""
+Shared fixtures. Each test drives its scenario with `run_with_db`, which runs it on a new
+event loop against a fresh in-memory schema, as the benchmarks do.
+"""
+import os
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+from benchmarks.classes_query_count import QueryCounter
+from tortoise import Tortoise
+import asyncio
+import logging
+import pytest
+
+async def _run_with_db(scenario):
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.database.models"]})
+    try:
+        await Tortoise.generate_schemas()
+        return await scenario()
+    finally:
+        await Tortoise.close_connections()
+
+@pytest.fixture
+def run_with_db():
+    """Call as `run_with_db(scenario)`, where `scenario` is an async function taking no arguments."""
+    return lambda scenario: asyncio.run(_run_with_db(scenario))
+
+@pytest.fixture
+def query_counter():
+    """A QueryCounter attached to Tortoise's per-query DEBUG log for the duration of the test."""
+    counter = QueryCounter()
+    db_logger = logging.getLogger("tortoise.db_client")
+    level, propagate = db_logger.level, db_logger.propagate
+    db_logger.addHandler(counter)
+    db_logger.setLevel(logging.DEBUG)
+    db_logger.propagate = False
+    yield counter
+    db_logger.removeHandler(counter)
+    db_logger.setLevel(level)
+    db_logger.propagate = propagate
@@ -0,0 +1,83 @@
+from app.auth.authz_epochs import authz_epochs, bump_authz_epoch
+from app.auth.principal_cache import principal_cache
+from app.database.models.roles import Role
+from app.database.models.user_roles import UserRole
+from app.database.models.users import User
+from app.middleware.auth import authenticate_request, get_current_user
+from app.utils.jwt_utils import create_access_token
+from fastapi import HTTPException, Request
+import pytest
+
+def make_request(token: str, path: str, method: str = "GET") -> Request:
+    return Request({
+        "type": "http",
+        "method": method,
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    })
+
+async def seed_admin() -> User:
+    user = await User.create(email="admin@test.example.com", username="admin", passwordHash="x")
+    role = await Role.create(name="admin", description="Admin")
+    await UserRole.create(user=user, role=role, description="Admin assignment")
+    return user
+
+@pytest.fixture(autouse=True)
+def empty_auth_caches():
+    principal_cache.clear()
+    authz_epochs._epochs.clear()
+    yield
+    principal_cache.clear()
+    authz_epochs._epochs.clear()
+
+def test_token_without_role_claims_is_a_zero_query_cache_hit(run_with_db, query_counter):
+    async def scenario():
+        user = await seed_admin()
+        token = create_access_token({"sub": str(user.id)})
+        reads = authz_epochs.reads
+        await authenticate_request(make_request(token, "/api/v1/metrics"))
+
+        query_counter.count = 0
+        await authenticate_request(make_request(token, "/api/v1/metrics"))
+        assert query_counter.count == 0, f"a cached principal took {query_counter.count} queries"
+        assert authz_epochs.reads == reads, "tokens without role claims must not read the authz epoch"
+
+    run_with_db(scenario)
+
+def test_role_claims_are_revoked_by_an_epoch_bump(run_with_db):
+    async def scenario():
+        user = await seed_admin()
+        token = create_access_token({"sub": str(user.id), "roles": ["admin"], "epoch": user.authzEpoch})
+        request = make_request(token, "/api/v1/metrics")
+        await authenticate_request(request)
+        assert not hasattr(request.state, "user"), "current role claims should not load the user"
+
+        await UserRole.filter(user_id=user.id).delete()
+        await bump_authz_epoch([str(user.id)])
+        with pytest.raises(HTTPException) as denied:
+            await authenticate_request(make_request(token, "/api/v1/metrics"))
+        assert denied.value.status_code == 403
+
+    run_with_db(scenario)
+
+def test_profile_changes_are_not_served_from_the_principal_cache(run_with_db):
+    async def scenario():
+        user = await seed_admin()
+        token = create_access_token({"sub": str(user.id)})
+        first = make_request(token, "/api/v1/bookings")
+        await authenticate_request(first)
+        assert (await get_current_user(first)).email == "admin@test.example.com"
+
+        # Another worker changes the email; this worker's principal cache is not invalidated
+        await User.filter(id=user.id).update(email="renamed@test.example.com")
+        second = make_request(token, "/api/v1/bookings")
+        await authenticate_request(second)
+        current = await get_current_user(second)
+        assert current.email == "renamed@test.example.com"
+        assert current is not first.state.user, "requests must not share one cached User instance"
+
+    run_with_db(scenario)
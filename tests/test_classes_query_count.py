@@ -0,0 +1,52 @@
+from app.database.models.users import User
+from app.schemas.bookings import BookingCreate
+from app.services.bookings import create_booking
+from app.services.catalog_cache import catalog_cache
+from app.services.classes import get_all_classes
+from benchmarks.classes_query_count import EXPECTED_QUERIES, check_counts_agree, seed
+import pytest
+
+CLASSES = 120
+BOOKINGS_PER_CLASS = 5
+
+@pytest.fixture(autouse=True)
+def bypass_catalog_cache(monkeypatch):
+    # Count the listing's own queries, not cache hits
+    monkeypatch.setattr(catalog_cache, "enabled", False)
+
+@pytest.mark.parametrize("limit", [1, 10, 50, 100])
+def test_listing_page_costs_constant_queries(run_with_db, query_counter, limit):
+    async def scenario():
+        await seed(CLASSES, BOOKINGS_PER_CLASS)
+        query_counter.count = 0
+        page = await get_all_classes(page=1, limit=limit)
+        assert len(page.items) == limit
+        assert query_counter.count == EXPECTED_QUERIES, f"page of {limit} took {query_counter.count} queries"
+        # Every fourth seeded booking is cancelled and must not count against the slots
+        assert all(item.available_slots == 5 + len(range(0, BOOKINGS_PER_CLASS, 4)) for item in page.items)
+
+    run_with_db(scenario)
+
+def test_cursor_pages_cost_one_query_each(run_with_db, query_counter):
+    async def scenario():
+        await seed(CLASSES, BOOKINGS_PER_CLASS)
+        cursor = (await get_all_classes(page=1, limit=50)).next_cursor
+        pages = 0
+        while cursor:
+            query_counter.count = 0
+            page = await get_all_classes(limit=50, cursor=cursor)
+            assert query_counter.count == 1, f"cursor page {pages + 1} took {query_counter.count} queries"
+            cursor, pages = page.next_cursor, pages + 1
+        assert pages == 2
+
+    run_with_db(scenario)
+
+def test_availability_agrees_with_bookings_after_create_booking(run_with_db):
+    async def scenario():
+        await seed(CLASSES, BOOKINGS_PER_CLASS)
+        booker = await User.create(email="booker@test.example.com", username="booker", passwordHash="x")
+        for item in (await get_all_classes(page=1, limit=10)).items:
+            await create_booking(BookingCreate(class_id=item.id, client_name="booker", client_email=booker.email), booker)
+        await check_counts_agree(limit=100)
+
+    run_with_db(scenario)
@@ -0,0 +1,45 @@
+from app.database.group_commit import GroupCommitWriter
+from app.database.models.roles import Role
+import asyncio
+import pytest
+
+async def create_role(name: str, delay: float = 0.0) -> Role:
+    role = await Role.create(name=name, description=name)
+    await asyncio.sleep(delay)
+    return role
+
+def test_units_share_one_commit(run_with_db):
+    async def scenario():
+        writer = GroupCommitWriter("default", window_ms=20, max_batch=100)
+        roles = await asyncio.gather(*(writer.submit(create_role, f"role{i}") for i in range(5)))
+        assert [role.name for role in roles] == [f"role{i}" for i in range(5)]
+        assert writer.stats()["batches"] == 1 and writer.stats()["units"] == 5
+
+    run_with_db(scenario)
+
+def test_submitter_cancelled_mid_window_drops_its_unit(run_with_db):
+    async def scenario():
+        writer = GroupCommitWriter("default", window_ms=50, max_batch=100)
+        cancelled = asyncio.create_task(writer.submit(create_role, "cancelled"))
+        kept = asyncio.create_task(writer.submit(create_role, "kept"))
+        await asyncio.sleep(0.01)  # Both units are queued, the window is still open
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert (await kept).name == "kept"
+        assert await Role.filter(name="cancelled").count() == 0, "a cancelled submitter's unit was committed"
+        assert writer.stats()["units"] == 1 and writer.stats()["cancelled_units"] == 1
+
+    run_with_db(scenario)
+
+def test_submitter_cancelled_while_its_unit_runs_gets_the_result(run_with_db):
+    async def scenario():
+        writer = GroupCommitWriter("default", window_ms=1, max_batch=100)
+        # As the request pipeline's timeout does: the deadline fires while the unit is running
+        async with asyncio.timeout(0.02):
+            role = await writer.submit(create_role, "slow", 0.1)
+        assert role.name == "slow"
+        assert await Role.filter(name="slow").count() == 1
+        assert writer.stats()["cancelled_units"] == 0
+
+    run_with_db(scenario)
@@ -0,0 +1,38 @@
+from app.database.models.refresh_tokens import RefreshToken
+from app.database.models.users import User
+from app.services.maintenance import purge_refresh_tokens, purgeable_refresh_tokens
+from datetime import datetime, timedelta, timezone
+from tortoise import Tortoise
+
+async def query_plan(queryset) -> str:
+    rows = await Tortoise.get_connection("default").execute_query_dict(
+        "EXPLAIN QUERY PLAN " + queryset.sql(params_inline=True)
+    )
+    return "\n".join(row["detail"] for row in rows)
+
+def test_purge_selects_batches_through_the_status_expiry_index(run_with_db):
+    async def scenario():
+        queryset = purgeable_refresh_tokens(datetime.now(timezone.utc)).limit(500).values_list("id", flat=True)
+        plan = await query_plan(queryset)
+        assert "SCAN refresh_tokens" not in plan, f"purge batch scans the table:\n{plan}"
+        assert "expiresAt<?" in plan, f"expired tokens are not a range search on the index:\n{plan}"
+
+    run_with_db(scenario)
+
+def test_purge_deletes_only_revoked_and_expired_tokens(run_with_db):
+    async def scenario():
+        user = await User.create(email="client@test.example.com", username="client", passwordHash="x")
+        now = datetime.now(timezone.utc)
+        tokens = {
+            "live": ("active", now + timedelta(days=1)),
+            "revoked": ("revoked", now + timedelta(days=1)),
+            "expired": ("active", now - timedelta(days=1)),
+            "expired_inactive": ("inactive", now - timedelta(days=1)),
+        }
+        for name, (status, expires_at) in tokens.items():
+            await RefreshToken.create(user=user, token_hash=name, status=status, expiresAt=expires_at, revoked=expires_at)
+
+        assert await purge_refresh_tokens() == 3
+        assert await RefreshToken.all().values_list("token_hash", flat=True) == ["live"]
+
+    run_with_db(scenario)
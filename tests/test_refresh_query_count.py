@@ -0,0 +1,60 @@
+from app.database.models.refresh_tokens import RefreshToken
+from app.schemas.user import RefreshRequest
+from app.services.user import _issue_refresh_token, refresh_token
+from app.utils.jwt_utils import decode_cache
+from benchmarks.refresh_query_count import EXPECTED_QUERIES, seed
+from fastapi import HTTPException
+import asyncio
+import pytest
+
+ROLES = 3
+
+def test_rotation_costs_constant_queries(run_with_db, query_counter):
+    async def scenario():
+        user = await seed(ROLES)
+        token = await _issue_refresh_token(user)
+        for rotation in range(20):
+            query_counter.count = 0
+            response = await refresh_token(RefreshRequest(refresh_token=token))
+            assert len(response.roles) == ROLES
+            assert query_counter.count == EXPECTED_QUERIES, f"rotation {rotation} took {query_counter.count} queries"
+            token = response.refresh_token
+
+    run_with_db(scenario)
+
+def test_concurrent_refresh_of_one_token_has_one_winner(run_with_db):
+    async def scenario():
+        user = await seed(ROLES)
+        token = await _issue_refresh_token(user)
+        results = await asyncio.gather(
+            refresh_token(RefreshRequest(refresh_token=token)),
+            refresh_token(RefreshRequest(refresh_token=token)),
+            return_exceptions=True,
+        )
+        rejected = [r for r in results if isinstance(r, HTTPException) and r.status_code == 401]
+        assert len(rejected) == 1, f"concurrent refresh results: {results}"
+        assert await RefreshToken.filter(user_id=user.id, status="active").count() == 1
+
+    run_with_db(scenario)
+
+def test_rotated_token_cannot_be_reused(run_with_db):
+    async def scenario():
+        user = await seed(ROLES)
+        token = await _issue_refresh_token(user)
+        await refresh_token(RefreshRequest(refresh_token=token))
+        with pytest.raises(HTTPException) as rejected:
+            await refresh_token(RefreshRequest(refresh_token=token))
+        assert rejected.value.status_code == 401
+
+    run_with_db(scenario)
+
+def test_refresh_tokens_are_not_kept_in_the_decode_cache(run_with_db):
+    async def scenario():
+        user = await seed(ROLES)
+        token = await _issue_refresh_token(user)
+        decode_cache.clear()
+        for _ in range(3):
+            token = (await refresh_token(RefreshRequest(refresh_token=token))).refresh_token
+        assert len(decode_cache) == 0, "single-use refresh tokens took decode cache slots"
+
+    run_with_db(scenario)